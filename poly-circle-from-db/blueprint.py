@@ -6,6 +6,8 @@ from constants import SM_BLOCK_INFO
 from tkinter import messagebox
 from poly import deteriorate_large_wedges
 
+PREVIEW_MAX_SIZE = 1280  # Largest side in pixels of the image the icon is made from
+
 def get_blueprints_directory():
     blueprint_dir = os.path.join(os.getenv('APPDATA'), 'Axolot Games', 'Scrap Mechanic', 'User')
     if not os.path.exists(blueprint_dir):
@@ -61,8 +63,10 @@ def export_blueprint(rects, wedges, diameter, material_choice, thickness, name,
     }
 
     # Define scaling and center shift for PNG image
-    scale = 10  # 10 pixels per unit
-    image_size = diameter * scale  # Image size based on diameter
+    # 10 pixels per unit, fewer for big polygons: the image only becomes a 128x128 icon, so it doesn't need to be
+    # diameter * 10 pixels square (1.6 GB of RGBA at diameter 2000)
+    scale = min(10, PREVIEW_MAX_SIZE / diameter)
+    image_size = round(diameter * scale)  # Image size based on diameter
     center_shift_x = image_size / 2
     center_shift_y = image_size / 2
 
@@ -1,6 +1,10 @@
 import sys
 import os
 
+# Largest radius and diameter the filters accept; the database can hold any size the generator was allowed to sweep
+RADIUS_LIMIT = 1000
+DIAMETER_LIMIT = 2 * RADIUS_LIMIT
+
 # Default Configuration Constants
 DEFAULT_CONFIG = {
     "DIFFERENCE_THRESHOLD": 0.5,
@@ -8,9 +12,9 @@ DEFAULT_CONFIG = {
     "UNIFORMITY_THRESHOLD": 0.0,
     "ODD_CENTER": "Both",  # Changed to string for selection
     "MIN_RADIUS": 1.0,
-    "MAX_RADIUS": 200.0,
+    "MAX_RADIUS": float(RADIUS_LIMIT),
     "MIN_DIAMETER": 1,
-    "MAX_DIAMETER": 400,
+    "MAX_DIAMETER": DIAMETER_LIMIT,
     "MAX_WIDTH": 8
 }
 
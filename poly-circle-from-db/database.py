@@ -11,7 +11,7 @@ def load_results_from_db(difference_threshold, circularity_threshold, uniformity
 
     # Start constructing the query
     query = """SELECT tested_radius, sides, real_radius, max_diff, max_width, diameter, 
-                      circularity, grid_points, odd_center, uniformity
+                      circularity, vertices, odd_center, uniformity
                FROM results
                WHERE max_diff <= ?
                  AND circularity >= ?
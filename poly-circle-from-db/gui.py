@@ -3,7 +3,9 @@ from tkinter import ttk
 from tkinter import messagebox
 import math
 import threading
-from constants import DEFAULT_CONFIG, SM_BLOCK_INFO
+from constants import DEFAULT_CONFIG, SM_BLOCK_INFO, RADIUS_LIMIT, DIAMETER_LIMIT
+from wedges import MAX_WEDGE_SIZE
+from vertices import decode_vertices
 import database
 import plot
 import poly
@@ -19,25 +21,11 @@ def on_row_selected(event, tree, canvas_frame, difference_threshold, min_radius,
     if not data_tuple:
         return
 
-    # The DB row returns the columns in the order: (tested_radius, sides, real_radius, max_diff, max_width, diameter, circularity, grid_points, odd_center, uniformity)
-    tested_radius, sides, real_radius, max_diff, max_width, diameter, circularity, grid_str, db_odd_center, uniformity = data_tuple
-
-    # Reconstruct the polygon from grid_points text
-    points_str = grid_str.strip()
-    point_pairs = points_str.split(')')
-    points = []
-    for p in point_pairs:
-        p = p.strip().strip(',')
-        if p.startswith('('):
-            p = p[1:]
-        if p:
-            try:
-                x_str, y_str = p.split(',')
-                x, y = float(x_str), float(y_str)
-                points.append((x, y))
-            except ValueError:
-                continue
-    polygon = tuple(points)
+    # The DB row returns the columns in the order: (tested_radius, sides, real_radius, max_diff, max_width, diameter, circularity, vertices, odd_center, uniformity)
+    tested_radius, sides, real_radius, max_diff, max_width, diameter, circularity, vertices_blob, db_odd_center, uniformity = data_tuple
+
+    # Rebuild the polygon from the binary vertices
+    polygon = decode_vertices(vertices_blob)
 
     # Determine odd_center for plotting based on row's odd_center value
     if db_odd_center == 1:
@@ -182,7 +170,7 @@ def create_gui():
     # Max Width
     label_max_width = ttk.Label(thresholds_frame, text="Max Width:")
     label_max_width.grid(row=3, column=0, padx=5, pady=5, sticky=tk.E)
-    spin_max_width = ttk.Spinbox(thresholds_frame, from_=1, to=8, width=13)
+    spin_max_width = ttk.Spinbox(thresholds_frame, from_=1, to=MAX_WEDGE_SIZE, width=13)
     spin_max_width.grid(row=3, column=1, padx=5, pady=5, sticky=tk.W)
     spin_max_width.set(str(DEFAULT_CONFIG["MAX_WIDTH"]))
     entries_thresholds["MAX_WIDTH"] = spin_max_width
@@ -208,7 +196,7 @@ def create_gui():
     entries_diameter = {}
     label_min_diameter = ttk.Label(diameter_frame, text="Min Diameter:")
     label_min_diameter.grid(row=0, column=0, padx=5, pady=5, sticky=tk.E)
-    spin_min_diameter = ttk.Spinbox(diameter_frame, from_=1, to=400, width=13)
+    spin_min_diameter = ttk.Spinbox(diameter_frame, from_=1, to=DIAMETER_LIMIT, width=13)
     spin_min_diameter.grid(row=0, column=1, padx=5, pady=5, sticky=tk.W)
     spin_min_diameter.set(str(DEFAULT_CONFIG["MIN_DIAMETER"]))
     entries_diameter["MIN_DIAMETER"] = spin_min_diameter
@@ -216,7 +204,7 @@ def create_gui():
     # Max Diameter Entry (Spinbox)
     label_max_diameter = ttk.Label(diameter_frame, text="Max Diameter:")
     label_max_diameter.grid(row=1, column=0, padx=5, pady=5, sticky=tk.E)
-    spin_max_diameter = ttk.Spinbox(diameter_frame, from_=1, to=400, width=13)
+    spin_max_diameter = ttk.Spinbox(diameter_frame, from_=1, to=DIAMETER_LIMIT, width=13)
     spin_max_diameter.grid(row=1, column=1, padx=5, pady=5, sticky=tk.W)
     spin_max_diameter.set(str(DEFAULT_CONFIG["MAX_DIAMETER"]))
     entries_diameter["MAX_DIAMETER"] = spin_max_diameter
@@ -239,7 +227,7 @@ def create_gui():
                                                            canvas_frame))
     load_button.pack(side=tk.TOP, fill=tk.X, padx=5, pady=5)
 
-    # Define Treeview Columns (match the DB exactly excluding the grid_points column)
+    # Define Treeview Columns (match the DB exactly excluding the vertices column)
     columns = (
         "tested_radius", "sides", "real_radius", "max_diff",
         "max_width", "diameter", "circularity", "uniformity", "odd_center"
@@ -335,24 +323,24 @@ def on_load_click(odd_center_var, entries_thresholds, entries_radius, entries_di
             raise ValueError("Uniformity Threshold must be between 0.0 and 1.0.")
 
         max_width_threshold = int(entries_thresholds["MAX_WIDTH"].get())
-        if not (1 <= max_width_threshold <= 8):
-            raise ValueError("Max Width must be between 1 and 8.")
+        if not (1 <= max_width_threshold <= MAX_WEDGE_SIZE):
+            raise ValueError(f"Max Width must be between 1 and {MAX_WEDGE_SIZE}.")
 
         min_radius = float(entries_radius["MIN_RADIUS"].get())
         max_radius = float(entries_radius["MAX_RADIUS"].get())
-        if min_radius < 0 or min_radius > 200:
-            raise ValueError("Min Radius must be between 0 and 200.")
-        if max_radius < 0 or max_radius > 200:
-            raise ValueError("Max Radius must be between 0 and 200.")
+        if min_radius < 0 or min_radius > RADIUS_LIMIT:
+            raise ValueError(f"Min Radius must be between 0 and {RADIUS_LIMIT}.")
+        if max_radius < 0 or max_radius > RADIUS_LIMIT:
+            raise ValueError(f"Max Radius must be between 0 and {RADIUS_LIMIT}.")
         if min_radius > max_radius:
             raise ValueError("Min Radius cannot be greater than Max Radius.")
 
         min_diameter = int(entries_diameter["MIN_DIAMETER"].get())
         max_diameter = int(entries_diameter["MAX_DIAMETER"].get())
-        if not (1 <= min_diameter <= 400):
-            raise ValueError("Min Diameter must be between 1 and 400.")
-        if not (1 <= max_diameter <= 400):
-            raise ValueError("Max Diameter must be between 1 and 400.")
+        if not (1 <= min_diameter <= DIAMETER_LIMIT):
+            raise ValueError(f"Min Diameter must be between 1 and {DIAMETER_LIMIT}.")
+        if not (1 <= max_diameter <= DIAMETER_LIMIT):
+            raise ValueError(f"Max Diameter must be between 1 and {DIAMETER_LIMIT}.")
         if min_diameter > max_diameter:
             raise ValueError("Min Diameter cannot be greater than Max Diameter.")
 
@@ -398,11 +386,11 @@ def insert_rows(tree, rows, canvas_frame):
     # Insert into the TreeView
     # columns = ("tested_radius", "sides", "real_radius", "max_diff", "max_width", "diameter", "circularity", "uniformity", "odd_center")
     for row in sorted_rows:
-        # row is (tested_radius, sides, real_radius, max_diff, max_width, diameter, circularity, grid_points, oc_val, uniformity)
-        tested_radius, sides, real_radius, max_diff, max_width, diameter, circularity, grid_points, oc_val, uniformity = row
+        # row is (tested_radius, sides, real_radius, max_diff, max_width, diameter, circularity, vertices, oc_val, uniformity)
+        tested_radius, sides, real_radius, max_diff, max_width, diameter, circularity, vertices_blob, oc_val, uniformity = row
 
         # Insert into the tree
-        # We'll show them in the exact order as columns, excluding grid_points
+        # We'll show them in the exact order as columns, excluding vertices
         tree_vals = (
             f"{tested_radius:.4f}",  # tested_radius
             f"{sides}",              # sides
@@ -12,9 +12,14 @@ import sys
 import os
 import math
 import sqlite3
+from vertices import decode_vertices
 
 matplotlib.use("TkAgg")
 
+# Largest radius and diameter the filters accept; the database can hold any size the generator was allowed to sweep
+RADIUS_LIMIT = 1000
+DIAMETER_LIMIT = 2 * RADIUS_LIMIT
+
 # Default Configuration Constants
 DEFAULT_CONFIG = {
     "DIFFERENCE_THRESHOLD": 0.5,
@@ -22,9 +27,9 @@ DEFAULT_CONFIG = {
     "UNIFORMITY_THRESHOLD": 0.0,
     "ODD_CENTER": "Both",  # Changed to string for selection
     "MIN_RADIUS": 1.0,
-    "MAX_RADIUS": 200.0,
+    "MAX_RADIUS": float(RADIUS_LIMIT),
     "MIN_DIAMETER": 1,
-    "MAX_DIAMETER": 400,
+    "MAX_DIAMETER": DIAMETER_LIMIT,
     "MAX_WIDTH": 8
 }
 
@@ -181,25 +186,11 @@ def on_row_selected(event, tree, canvas_frame, difference_threshold, min_radius,
     if not data_tuple:
         return
 
-    # The DB row returns the columns in the order: (tested_radius, sides, real_radius, max_diff, max_width, diameter, circularity, grid_points, odd_center, uniformity)
-    tested_radius, sides, real_radius, max_diff, max_width, diameter, circularity, grid_str, db_odd_center, uniformity = data_tuple
-
-    # Reconstruct the polygon from grid_points text
-    points_str = grid_str.strip()
-    point_pairs = points_str.split(')')
-    points = []
-    for p in point_pairs:
-        p = p.strip().strip(',')
-        if p.startswith('('):
-            p = p[1:]
-        if p:
-            try:
-                x_str, y_str = p.split(',')
-                x, y = float(x_str), float(y_str)
-                points.append((x, y))
-            except ValueError:
-                continue
-    polygon = tuple(points)
+    # The DB row returns the columns in the order: (tested_radius, sides, real_radius, max_diff, max_width, diameter, circularity, vertices, odd_center, uniformity)
+    tested_radius, sides, real_radius, max_diff, max_width, diameter, circularity, vertices_blob, db_odd_center, uniformity = data_tuple
+
+    # Rebuild the polygon from the binary vertices
+    polygon = decode_vertices(vertices_blob)
 
     # Determine odd_center for plotting based on row's odd_center value
     if db_odd_center == 1:
@@ -313,7 +304,7 @@ def load_results_from_db(difference_threshold, circularity_threshold, uniformity
 
     # Start constructing the query
     query = """SELECT tested_radius, sides, real_radius, max_diff, max_width, diameter, 
-                      circularity, grid_points, odd_center, uniformity
+                      circularity, vertices, odd_center, uniformity
                FROM results
                WHERE max_diff <= ?
                  AND circularity >= ?
@@ -367,19 +358,19 @@ def on_load_click(odd_center_var, entries_thresholds, entries_radius, entries_di
 
         min_radius = float(entries_radius["MIN_RADIUS"].get())
         max_radius = float(entries_radius["MAX_RADIUS"].get())
-        if min_radius < 0 or min_radius > 200:
-            raise ValueError("Min Radius must be between 0 and 200.")
-        if max_radius < 0 or max_radius > 200:
-            raise ValueError("Max Radius must be between 0 and 200.")
+        if min_radius < 0 or min_radius > RADIUS_LIMIT:
+            raise ValueError(f"Min Radius must be between 0 and {RADIUS_LIMIT}.")
+        if max_radius < 0 or max_radius > RADIUS_LIMIT:
+            raise ValueError(f"Max Radius must be between 0 and {RADIUS_LIMIT}.")
         if min_radius > max_radius:
             raise ValueError("Min Radius cannot be greater than Max Radius.")
 
         min_diameter = int(entries_diameter["MIN_DIAMETER"].get())
         max_diameter = int(entries_diameter["MAX_DIAMETER"].get())
-        if not (1 <= min_diameter <= 400):
-            raise ValueError("Min Diameter must be between 1 and 400.")
-        if not (1 <= max_diameter <= 400):
-            raise ValueError("Max Diameter must be between 1 and 400.")
+        if not (1 <= min_diameter <= DIAMETER_LIMIT):
+            raise ValueError(f"Min Diameter must be between 1 and {DIAMETER_LIMIT}.")
+        if not (1 <= max_diameter <= DIAMETER_LIMIT):
+            raise ValueError(f"Max Diameter must be between 1 and {DIAMETER_LIMIT}.")
         if min_diameter > max_diameter:
             raise ValueError("Min Diameter cannot be greater than Max Diameter.")
 
@@ -415,11 +406,11 @@ def on_load_click(odd_center_var, entries_thresholds, entries_radius, entries_di
     # Insert into the TreeView
     # columns = ("tested_radius", "sides", "real_radius", "max_diff", "max_width", "diameter", "circularity", "uniformity", "odd_center")
     for row in rows:
-        # row is (tested_radius, sides, real_radius, max_diff, max_width, diameter, circularity, grid_points, odd_center, uniformity)
-        tested_radius, sides, real_radius, max_diff, max_width, diameter, circularity, grid_points, oc_val, uniformity = row
+        # row is (tested_radius, sides, real_radius, max_diff, max_width, diameter, circularity, vertices, odd_center, uniformity)
+        tested_radius, sides, real_radius, max_diff, max_width, diameter, circularity, vertices_blob, oc_val, uniformity = row
 
         # Insert into the tree
-        # We'll show them in the exact order as columns, excluding grid_points
+        # We'll show them in the exact order as columns, excluding vertices
         tree_vals = (
             f"{tested_radius:.4f}",  # tested_radius
             f"{sides}",              # sides
@@ -529,7 +520,7 @@ def main():
     entries_diameter = {}
     label_min_diameter = ttk.Label(diameter_frame, text="Min Diameter:")
     label_min_diameter.grid(row=0, column=0, padx=5, pady=5, sticky=tk.E)
-    spin_min_diameter = ttk.Spinbox(diameter_frame, from_=1, to=400, width=13)
+    spin_min_diameter = ttk.Spinbox(diameter_frame, from_=1, to=DIAMETER_LIMIT, width=13)
     spin_min_diameter.grid(row=0, column=1, padx=5, pady=5, sticky=tk.W)
     spin_min_diameter.set(str(DEFAULT_CONFIG["MIN_DIAMETER"]))
     entries_diameter["MIN_DIAMETER"] = spin_min_diameter
@@ -537,7 +528,7 @@ def main():
     # Max Diameter Entry (Spinbox)
     label_max_diameter = ttk.Label(diameter_frame, text="Max Diameter:")
     label_max_diameter.grid(row=1, column=0, padx=5, pady=5, sticky=tk.E)
-    spin_max_diameter = ttk.Spinbox(diameter_frame, from_=1, to=400, width=13)
+    spin_max_diameter = ttk.Spinbox(diameter_frame, from_=1, to=DIAMETER_LIMIT, width=13)
     spin_max_diameter.grid(row=1, column=1, padx=5, pady=5, sticky=tk.W)
     spin_max_diameter.set(str(DEFAULT_CONFIG["MAX_DIAMETER"]))
     entries_diameter["MAX_DIAMETER"] = spin_max_diameter
@@ -560,7 +551,7 @@ def main():
                                                            canvas_frame))
     load_button.pack(side=tk.TOP, fill=tk.X, padx=5, pady=5)
 
-    # Define Treeview Columns (match the DB exactly excluding the grid_points column)
+    # Define Treeview Columns (match the DB exactly excluding the vertices column)
     columns = (
         "tested_radius", "sides", "real_radius", "max_diff",
         "max_width", "diameter", "circularity", "uniformity", "odd_center"
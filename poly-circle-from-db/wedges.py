@@ -0,0 +1,103 @@
+from array import array
+from math import gcd
+
+# Kept identical in poly-circle-to-db/ and poly-circle-from-db/ so the generator and the viewer agree on wedges.
+
+MAX_WEDGE_SIZE = 8    # Scrap Mechanic wedges only go up to 8x8
+MAX_EDGE_SIZE = 400   # Largest |dx| or |dy| the lookup tables cover; longer edges are computed directly
+
+def compute_edge_buildable(delta_x, delta_y):
+    """
+    Whether an edge with these absolute deltas can be built from blocks and wedges of at most 8x8.
+    """
+    # Condition 1
+    if delta_x == 0 or delta_y == 0 or delta_x == delta_y:
+        return True
+
+    # Condition 2
+    if delta_x <= MAX_WEDGE_SIZE and delta_y <= MAX_WEDGE_SIZE:
+        return True
+
+    # Condition 3
+    common_divisor = gcd(delta_x, delta_y)
+    if common_divisor > 1:
+        simplified_x = delta_x // common_divisor
+        simplified_y = delta_y // common_divisor
+        if simplified_x <= MAX_WEDGE_SIZE and simplified_y <= MAX_WEDGE_SIZE:
+            return True
+
+    return False
+
+def compute_edge_width(delta_x, delta_y):
+    """
+    Width of the smallest wedge step an edge with these absolute deltas reduces to.
+    """
+    common_divisor = gcd(delta_x, delta_y) if delta_x and delta_y else max(delta_x, delta_y)
+    if common_divisor == 0:
+        simplified_x, simplified_y = delta_x, delta_y
+    else:
+        simplified_x = delta_x // common_divisor
+        simplified_y = delta_y // common_divisor
+    return min(simplified_x, simplified_y)
+
+def compute_split_divisor(width, height):
+    """
+    Number of equal wedges a width x height wedge is split into: the smallest common divisor that brings both
+    sides down to 8 or less, falling back to the gcd when there is none. Wedges that already fit are not split.
+    A zero side has no common divisors to pick from, so axis-aligned edges always take the gcd (the other side).
+    """
+    if width <= MAX_WEDGE_SIZE and height <= MAX_WEDGE_SIZE:
+        return 1
+    common_divisor = gcd(width, height)
+    if width == 0 or height == 0:
+        return common_divisor
+    for d in range(1, common_divisor + 1):
+        if common_divisor % d == 0 and width // d <= MAX_WEDGE_SIZE and height // d <= MAX_WEDGE_SIZE:
+            return d
+    return common_divisor
+
+def build_tables(size):
+    """
+    Dense tables indexed by delta_x * (size + 1) + delta_y for every 0 <= delta_x, delta_y <= size. Same values as
+    the compute_* functions, but with a single gcd per cell.
+    """
+    buildable = bytearray((size + 1) * (size + 1))
+    widths = array('H', bytes(2 * (size + 1) * (size + 1)))
+    divisors = array('H', [1]) * ((size + 1) * (size + 1))
+    index = 0
+    for delta_x in range(size + 1):
+        for delta_y in range(size + 1):
+            common_divisor = gcd(delta_x, delta_y)
+            if common_divisor == 0:
+                buildable[index] = 1
+            else:
+                simplified_x = delta_x // common_divisor
+                simplified_y = delta_y // common_divisor
+                small = delta_x <= MAX_WEDGE_SIZE and delta_y <= MAX_WEDGE_SIZE
+                reducible = simplified_x <= MAX_WEDGE_SIZE and simplified_y <= MAX_WEDGE_SIZE
+                if small or reducible or delta_x == 0 or delta_y == 0 or delta_x == delta_y:
+                    buildable[index] = 1
+                widths[index] = min(simplified_x, simplified_y)
+                if not small:
+                    divisors[index] = compute_split_divisor(delta_x, delta_y) if reducible and delta_x and delta_y else common_divisor
+            index += 1
+    return buildable, widths, divisors
+
+# Built once per process, on first import
+_STRIDE = MAX_EDGE_SIZE + 1
+_BUILDABLE, _WIDTHS, _DIVISORS = build_tables(MAX_EDGE_SIZE)
+
+def is_edge_buildable(delta_x, delta_y):
+    if delta_x <= MAX_EDGE_SIZE and delta_y <= MAX_EDGE_SIZE:
+        return _BUILDABLE[delta_x * _STRIDE + delta_y] == 1
+    return compute_edge_buildable(delta_x, delta_y)
+
+def edge_width(delta_x, delta_y):
+    if delta_x <= MAX_EDGE_SIZE and delta_y <= MAX_EDGE_SIZE:
+        return _WIDTHS[delta_x * _STRIDE + delta_y]
+    return compute_edge_width(delta_x, delta_y)
+
+def split_divisor(width, height):
+    if width <= MAX_EDGE_SIZE and height <= MAX_EDGE_SIZE:
+        return _DIVISORS[width * _STRIDE + height]
+    return compute_split_divisor(width, height)
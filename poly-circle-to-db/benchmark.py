@@ -0,0 +1,428 @@
+import argparse
+import json
+import math
+import os
+import platform
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+from datetime import datetime, timezone
+from multiprocessing import cpu_count
+from poly import (boundary_columns, cross, is_collinear, is_between, remove_collinear_points, compute_for_radius, compute_for_radius_symmetric,
+                  FILTERS, shoelace_area, polygon_perimeter, limit_radius, lattice_distances, critical_radii)
+from wedges import edge_width
+from database import ResultWriter, encode_polygon
+from sweep import plan_sweep, plan_sweeps, run_sweep, sweep_to_database, add_intervals
+from telemetry import STAGES, StageTimer
+from constants import DEFAULT_CONFIG
+try:
+    import numpy as np
+except ImportError:  # Only the metrics benchmark needs it
+    np = None
+
+# Headless benchmarks for the generator. Run before and after a change with --json and compare the files: every
+# section records what it measured, and the environment block says where.
+
+BENCHMARK_RADII = (5, 10, 25, 50, 100, 200, 400)
+# Each engine band is the critical radii in [radius, radius + 1]
+ENGINE_BENCHMARK_BANDS = (5, 25, 100, 200, 400)
+ENGINES = (("compute_for_radius", compute_for_radius), ("compute_for_radius_symmetric", compute_for_radius_symmetric))
+# (initial radius, max radius) of the end-to-end sweeps, both centers each
+SWEEP_BENCHMARK_RANGES = ((5, 50), (5, 100), (150, 200))
+DATABASE_BENCHMARK_MAX_RADIUS = 120
+METRICS_BENCHMARK_MAX_RADIUS = 120
+METRIC_NAMES = ("area", "perimeter", "circularity", "real_radius", "max_diff", "max_width", "uniformity", "diameter")
+
+def remove_collinear_points_multipass(points):
+    """
+    The previous implementation of remove_collinear_points, kept as the baseline: it repeats full passes and
+    rebuilds the list until nothing changes.
+    """
+    if len(points) < 3:
+        return points
+
+    changed = True
+    while changed:
+        changed = False
+        new_points = []
+        n = len(points)
+        for i in range(n):
+            prev_p = points[(i - 1) % n]
+            curr_p = points[i]
+            next_p = points[(i + 1) % n]
+
+            if is_collinear(prev_p, curr_p, next_p) and is_between(prev_p, curr_p, next_p):
+                changed = True
+            else:
+                new_points.append(curr_p)
+        points = new_points
+        if len(points) < 3:
+            break
+
+    return points
+
+def hull_with_collinear_points(center_x, center_y, radius):
+    """
+    Convex hull of the circle's grid points that keeps the points lying on its edges, so the simplifiers
+    have real work to do.
+    """
+    points = boundary_columns(center_x, center_y, radius)
+    lower = []
+    for p in points:
+        while len(lower) >= 2 and cross(lower[-2], lower[-1], p) < 0:
+            lower.pop()
+        lower.append(p)
+    upper = []
+    for p in reversed(points):
+        while len(upper) >= 2 and cross(upper[-2], upper[-1], p) < 0:
+            upper.pop()
+        upper.append(p)
+    return lower[:-1] + upper[:-1]
+
+def best_time(function, argument, repeat=5):
+    """
+    Best per-call time in seconds over several timing runs.
+    """
+    timer = timeit.Timer(lambda: function(argument))
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+def benchmark_collinear(radii=BENCHMARK_RADII, center_x=0.5, center_y=0.5):
+    rows = []
+    for radius in radii:
+        hull = hull_with_collinear_points(center_x, center_y, radius)
+        if remove_collinear_points(hull) != remove_collinear_points_multipass(hull):
+            raise AssertionError(f"Simplifiers disagree at radius {radius}")
+        multipass = best_time(remove_collinear_points_multipass, hull)
+        single_pass = best_time(remove_collinear_points, hull)
+        rows.append((radius, len(hull), multipass, single_pass))
+    return rows
+
+def save_results_row_by_row(results, odd_center_val, database_path):
+    """
+    The save path before the sweep streamed into ResultWriter, kept as the baseline: a SELECT and then an UPDATE or
+    INSERT per result with the default journal, on the text-keyed table. Returns rows per second like the writer.
+    """
+    conn = sqlite3.connect(database_path)
+    c = conn.cursor()
+    start = time.perf_counter()
+    c.execute("""CREATE TABLE IF NOT EXISTS results (
+                    tested_radius REAL,
+                    sides INTEGER,
+                    real_radius REAL,
+                    max_diff REAL,
+                    max_width INTEGER,
+                    diameter INTEGER,
+                    circularity REAL,
+                    grid_points TEXT,
+                    odd_center INTEGER,
+                    uniformity REAL,
+                    max_tested_radius REAL,
+                    UNIQUE(grid_points, odd_center)
+                )""")
+    for r in results:
+        tested_radius, sides, real_radius, max_diff, max_width, diameter, circularity, polygon, uniformity, max_tested_radius = r
+        polygon_str = ",".join(f"({x},{y})" for x, y in polygon)
+        c.execute("SELECT tested_radius, max_tested_radius FROM results WHERE grid_points = ? AND odd_center = ?", (polygon_str, odd_center_val))
+        existing = c.fetchone()
+        if existing is not None:
+            existing_tested_radius, existing_max_tested_radius = existing
+            if tested_radius < existing_tested_radius:
+                c.execute("""UPDATE results SET tested_radius=?, sides=?, real_radius=?, max_diff=?, max_width=?, diameter=?, circularity=?, uniformity=?, max_tested_radius=?
+                             WHERE grid_points=? AND odd_center=?""",
+                          (tested_radius, sides, real_radius, max_diff, max_width, diameter, circularity, uniformity, max_tested_radius, polygon_str, odd_center_val))
+            elif existing_max_tested_radius is None:
+                c.execute("UPDATE results SET max_tested_radius=? WHERE grid_points=? AND odd_center=?",
+                          (max_tested_radius, polygon_str, odd_center_val))
+        else:
+            c.execute("""INSERT INTO results (tested_radius, sides, real_radius, max_diff, max_width, diameter, circularity, grid_points, odd_center, uniformity, max_tested_radius)
+                         VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                      (tested_radius, sides, real_radius, max_diff, max_width, diameter, circularity, polygon_str, odd_center_val, uniformity, max_tested_radius))
+    conn.commit()
+    elapsed = time.perf_counter() - start
+    conn.close()
+    return len(results) / elapsed if elapsed > 0 else 0
+
+def save_results_streaming(results, odd_center_val, database_path, encoded=None):
+    """
+    Saves results through a ResultWriter, the path sweep_to_database streams into. Returns the writer's rows per
+    second.
+    """
+    with ResultWriter(database_path) as writer:
+        writer.write(odd_center_val, results, encoded=encoded)
+    return writer.rows_per_second()
+
+def benchmark_engines(bands=ENGINE_BENCHMARK_BANDS, center_x=0.5, center_y=0.5):
+    """
+    Mean seconds per radius of each engine over every band, with the mean seconds per stage from a timed pass.
+    Rows are (engine, radius, radii in the band, seconds per radius, stage seconds per radius).
+    """
+    distances = lattice_distances(center_x, center_y, max(bands) + 1)
+    rows = []
+    for radius in bands:
+        band = [(center_x, center_y, r, True, DEFAULT_CONFIG["DIFFERENCE_THRESHOLD"], FILTERS)
+                for r in critical_radii(distances, radius, radius + 1)]
+        for name, engine in ENGINES:
+            seconds = best_time(lambda band: [engine(args) for args in band], band) / len(band)
+            timer = StageTimer()
+            for args in band:
+                timer.start()
+                engine(args, timer)
+            rows.append((name, radius, len(band), seconds, [total / len(band) for total in timer.totals]))
+    return rows
+
+def benchmark_sweeps(ranges=SWEEP_BENCHMARK_RANGES):
+    """
+    End-to-end critical radii sweeps of both centers on one worker, into an empty database. Rows are (initial radius,
+    max radius, radii, rows written, wall seconds, database rows per second).
+    """
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        for initial_radius, max_radius in ranges:
+            path = os.path.join(directory, f"sweep_{initial_radius}_{max_radius}.db")
+            config = dict(DEFAULT_CONFIG, BOTH_CENTERS=True, CENTER_X=0.0, CENTER_Y=0.0, INITIAL_RADIUS=initial_radius,
+                          MAX_RADIUS=max_radius, CRITICAL_RADII=True, RESUME=False, WORKERS=1)
+            start = time.perf_counter()
+            plans, planned = plan_sweeps(config, path)
+            _, writer = sweep_to_database(compute_for_radius_symmetric, plans, path)
+            rows.append((initial_radius, max_radius, planned, writer.rows_written, time.perf_counter() - start,
+                         writer.rows_per_second()))
+    return rows
+
+def benchmark_database(max_radius=DATABASE_BENCHMARK_MAX_RADIUS):
+    """
+    Rows per second of the save paths on the transitions of an odd-center sweep, into an empty database (all
+    inserts) and again into the filled one (all conflicts), and the size of the file written. The writer is timed
+    with the vertices encoded on its thread and with them encoded beforehand, as the sweep's workers do.
+    """
+    config = {"CENTER_X": 0.5, "CENTER_Y": 0.5, "INITIAL_RADIUS": 1, "MAX_RADIUS": max_radius, "CRITICAL_RADII": True}
+    radii, distances = plan_sweep(config)
+    results, _ = run_sweep(compute_for_radius_symmetric, (0.5, 0.5, True, 0.5, FILTERS), radii, 1)
+    results = add_intervals(results, distances)
+
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        encoded = [encode_polygon(res[7], 1) for res in results]
+        pre_encoded = lambda results, odd_center_val, path: save_results_streaming(results, odd_center_val, path, encoded)
+        for name, save in (("row by row", save_results_row_by_row), ("writer", save_results_streaming),
+                           ("writer, encoded", pre_encoded)):
+            path = os.path.join(directory, name.replace(" ", "_") + ".db")
+            rows.append((name, len(results), save(results, 1, path), save(results, 1, path), os.path.getsize(path)))
+    return rows
+
+def polygon_metrics_loop(polygon, center_x, center_y):
+    """
+    The per-vertex loops compute_for_radius runs on every polygon, kept as the baseline for batch_metrics.
+    """
+    offset_x = round(2 * center_x)
+    offset_y = round(2 * center_y)
+    squared_distances = [(2 * x - offset_x) ** 2 + (2 * y - offset_y) ** 2 for x, y in polygon]
+    real_radius = limit_radius(max(squared_distances))
+    max_diff = real_radius - limit_radius(min(squared_distances))
+    x_values = [p[0] for p in polygon]
+    diameter = max(x_values) - min(x_values)
+    area = shoelace_area(polygon)
+    perimeter = polygon_perimeter(polygon)
+    circularity = (4 * math.pi * area) / (perimeter ** 2) if perimeter > 0 else 0
+
+    n = len(polygon)
+    widths = []
+    side_lengths = []
+    for i in range(n):
+        A = polygon[i]
+        B = polygon[(i + 1) % n]
+        delta_x = abs(B[0] - A[0])
+        delta_y = abs(B[1] - A[1])
+        if delta_x or delta_y:
+            widths.append(edge_width(delta_x, delta_y))
+        side_lengths.append(math.hypot(B[0] - A[0], B[1] - A[1]))
+    max_width = max(widths) if widths else 0
+    max_length = max(side_lengths)
+    uniformity = sum(side_lengths) / len(side_lengths) / max_length if max_length != 0 else 0
+    return {"area": area, "perimeter": perimeter, "circularity": circularity, "real_radius": real_radius,
+            "max_diff": max_diff, "max_width": max_width, "uniformity": uniformity, "diameter": diameter}
+
+# Polygon metrics for many polygons at once with NumPy, measured against the per-polygon loops the engines run.
+# Same definitions, but the sums go through NumPy's pairwise summation, so perimeter, circularity and uniformity can
+# differ from the engines in the last bits.
+
+def pad_polygons(polygons):
+    """
+    Packs polygons with different vertex counts into an (n, max_vertices, 2) int64 array plus the counts. Each
+    polygon is padded with copies of its first vertex, so after its last real vertex every edge either closes the
+    polygon or has zero length and adds nothing to any metric.
+    """
+    counts = np.fromiter((len(polygon) for polygon in polygons), dtype=np.int64, count=len(polygons))
+    size = int(counts.max()) if len(polygons) else 0
+    vertices = np.empty((len(polygons), size, 2), dtype=np.int64)
+    for row, polygon in enumerate(polygons):
+        n = len(polygon)
+        vertices[row, :n] = polygon
+        vertices[row, n:] = polygon[0]
+    return vertices, counts
+
+def batch_metrics(polygons, center_x, center_y):
+    """
+    Returns a dict with one array per name in METRIC_NAMES, one value per polygon. polygons is a list of vertex
+    sequences, each in order around the center.
+    """
+    vertices, counts = pad_polygons(polygons)
+    return padded_metrics(vertices, counts, center_x, center_y)
+
+def padded_metrics(vertices, counts, center_x, center_y):
+    """
+    batch_metrics for polygons already packed by pad_polygons.
+    """
+    if len(counts) == 0:
+        return {name: np.empty(0) for name in METRIC_NAMES}
+
+    x = vertices[..., 0]
+    y = vertices[..., 1]
+    next_x = np.roll(x, -1, axis=1)
+    next_y = np.roll(y, -1, axis=1)
+
+    # Squared distances in doubled coordinates (see poly.inside_limit), only the extremes need a square root
+    doubled_x = 2 * x - round(2 * center_x)
+    doubled_y = 2 * y - round(2 * center_y)
+    squared_distances = doubled_x * doubled_x + doubled_y * doubled_y
+    real_radius = np.sqrt(squared_distances.max(axis=1)) / 2
+    max_diff = real_radius - np.sqrt(squared_distances.min(axis=1)) / 2
+
+    diameter = x.max(axis=1) - x.min(axis=1)
+
+    # Shoelace terms are exact in int64
+    area = np.abs((x * next_y - next_x * y).sum(axis=1)) / 2.0
+
+    delta_x = np.abs(next_x - x)
+    delta_y = np.abs(next_y - y)
+    side_lengths = np.hypot(delta_x, delta_y)
+    perimeter = side_lengths.sum(axis=1)
+    circularity = np.divide(4 * np.pi * area, perimeter ** 2, out=np.zeros_like(area), where=perimeter > 0)
+
+    # wedges.edge_width without the table, so any edge size works: the smaller delta over the gcd, 0 along an
+    # axis. The zero-length padding edges come out as 0 too, which is what compute_for_radius skipping them gives.
+    widths = np.minimum(delta_x, delta_y) // np.maximum(np.gcd(delta_x, delta_y), 1)
+    max_width = widths.max(axis=1)
+
+    max_length = side_lengths.max(axis=1)
+    average_length = perimeter / counts
+    uniformity = np.divide(average_length, max_length, out=np.zeros_like(average_length), where=max_length != 0)
+
+    return {
+        "area": area,
+        "perimeter": perimeter,
+        "circularity": circularity,
+        "real_radius": real_radius,
+        "max_diff": max_diff,
+        "max_width": max_width,
+        "uniformity": uniformity,
+        "diameter": diameter
+    }
+
+def benchmark_metrics(max_radius=METRICS_BENCHMARK_MAX_RADIUS, center_x=0.5, center_y=0.5):
+    """
+    Seconds to compute the metrics of every polygon of a sweep with the per-polygon loops and with one
+    batch_metrics call, the polygon count, and the largest difference between the two.
+    """
+    if np is None:
+        raise ImportError("NumPy is not installed")
+
+    config = {"CENTER_X": center_x, "CENTER_Y": center_y, "INITIAL_RADIUS": 1, "MAX_RADIUS": max_radius, "CRITICAL_RADII": True}
+    radii, _ = plan_sweep(config)
+    results, _ = run_sweep(compute_for_radius_symmetric, (center_x, center_y, False, float("inf"), FILTERS), radii, 1)
+    polygons = [res[7] for res in results]
+
+    start = time.perf_counter()
+    loop = [polygon_metrics_loop(polygon, center_x, center_y) for polygon in polygons]
+    loop_time = time.perf_counter() - start
+    start = time.perf_counter()
+    batch = batch_metrics(polygons, center_x, center_y)
+    batch_time = time.perf_counter() - start
+
+    max_error = max(abs(float(batch[name][row]) - metrics[name]) for row, metrics in enumerate(loop) for name in METRIC_NAMES)
+    return len(polygons), loop_time, batch_time, max_error
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)),
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def environment_info():
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_commit": git_commit(),
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": cpu_count(),
+        "sqlite": sqlite3.sqlite_version
+    }
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the polygon generator.")
+    parser.add_argument("--json", metavar="PATH", help="Also write the results, with environment info, to this JSON file")
+    parser.add_argument("--database", action="store_true", help="Only run the database benchmark")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = {"environment": environment_info()}
+
+    if not args.database:
+        rows = benchmark_collinear()
+        report["collinear"] = [dict(zip(("radius", "points", "multipass_seconds", "single_pass_seconds"), row)) for row in rows]
+        print(f"{'radius':>8} {'points':>8} {'multipass us':>14} {'single pass us':>16} {'speedup':>9}")
+        for radius, points, multipass, single_pass in rows:
+            print(f"{radius:>8} {points:>8} {multipass * 1e6:>14.1f} {single_pass * 1e6:>16.1f} {multipass / single_pass:>8.2f}x")
+        print()
+
+        rows = benchmark_engines()
+        report["engines"] = [{"engine": name, "radius": radius, "radii": count, "seconds_per_radius": seconds,
+                              "stage_seconds_per_radius": dict(zip(STAGES, stage_seconds))}
+                             for name, radius, count, seconds, stage_seconds in rows]
+        print(f"{'engine':>30} {'radius':>8} {'radii':>7} {'us/radius':>11}  stages us/radius")
+        for name, radius, count, seconds, stage_seconds in rows:
+            stages = ", ".join(f"{stage} {seconds * 1e6:.1f}" for stage, seconds in zip(STAGES, stage_seconds))
+            print(f"{name:>30} {radius:>8} {count:>7} {seconds * 1e6:>11.1f}  {stages}")
+        print()
+
+        rows = benchmark_sweeps()
+        report["sweeps"] = [dict(zip(("initial_radius", "max_radius", "radii", "rows", "seconds", "database_rows_per_second"), row))
+                            for row in rows]
+        print(f"{'sweep':>10} {'radii':>8} {'rows':>8} {'seconds':>9} {'radii/s':>9} {'db rows/s':>10}")
+        for initial_radius, max_radius, radii, count, seconds, rows_per_second in rows:
+            print(f"{f'{initial_radius}-{max_radius}':>10} {radii:>8} {count:>8} {seconds:>9.2f} {radii / seconds:>9.0f} {rows_per_second:>10.0f}")
+        print()
+
+    rows = benchmark_database()
+    report["database"] = [dict(zip(("save_path", "rows", "insert_rows_per_second", "conflict_rows_per_second", "file_bytes"), row))
+                          for row in rows]
+    print(f"{'save path':>20} {'rows':>8} {'insert rows/s':>15} {'conflict rows/s':>17} {'file KiB':>10}")
+    for name, count, inserts, conflicts, size in rows:
+        print(f"{name:>20} {count:>8} {inserts:>15.0f} {conflicts:>17.0f} {size / 1024:>10.0f}")
+    print()
+
+    if not args.database:
+        try:
+            count, loop_time, batch_time, max_error = benchmark_metrics()
+        except ImportError:
+            report["metrics"] = None
+            print("Metrics: skipped, NumPy is not installed")
+        else:
+            report["metrics"] = {"polygons": count, "loop_seconds": loop_time, "batch_seconds": batch_time, "max_difference": max_error}
+            print(f"Metrics for {count} polygons: loops {loop_time * 1e3:.1f} ms, batch {batch_time * 1e3:.1f} ms "
+                  f"({loop_time / batch_time:.1f}x), largest difference {max_error:.2e}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
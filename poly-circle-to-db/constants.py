@@ -0,0 +1,24 @@
+from multiprocessing import cpu_count
+
+MAX_CPU_CORES = 4
+
+# Radii the generator sweeps: INITIAL_RADIUS from MIN_RADIUS_LIMIT, MAX_RADIUS up to RADIUS_LIMIT. A worker holds at
+# most one batch of polygons at a time (see sweep.MAX_BATCH_COST), but the lattice table a sweep shares with its
+# workers (see lattice.py) holds 24 bytes per octant point: about 9 MiB at 1000, growing with the radius squared.
+MIN_RADIUS_LIMIT = 1
+RADIUS_LIMIT = 1000
+
+# Default Configuration Constants
+DEFAULT_CONFIG = {
+    "ODD_CENTER": False,          # If True, center = (0.5, 0.5); if False, center = (0, 0)
+    "BOTH_CENTERS": False,        # If True, sweep both centers in one run and ignore ODD_CENTER
+    "INITIAL_RADIUS": 5,
+    "RADIUS_INCREMENT": 0.0025,
+    "MAX_RADIUS": 40,
+    "CHECK_DIMENSIONS": True,
+    "CRITICAL_RADII": True,       # If True, only test the exact radii where a new grid point enters the circle
+    "DIFFERENCE_THRESHOLD": 0.5,
+    "FILTER_ORDER": ("max_diff", "check_dimensions"),  # Rejection tests in the order they run, cheapest first
+    "RESUME": True,               # If True, skip radii a previous critical radii sweep with the same settings covered
+    "WORKERS": min(cpu_count(), MAX_CPU_CORES)
+}
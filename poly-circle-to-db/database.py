@@ -0,0 +1,265 @@
+import os
+import queue
+import sqlite3
+import threading
+import time
+from poly import polygon_key, parse_grid_points
+from vertices import encode_vertices
+
+DATABASE_PATH = "results.db"
+# Streaming writer: commit after this many rows or this many seconds, with at most WRITER_QUEUE_SIZE ranges waiting
+WRITER_BATCH_ROWS = 500
+WRITER_FLUSH_SECONDS = 1.0
+WRITER_QUEUE_SIZE = 64
+
+# Polygons are unique per parity through polygon_key, a 64-bit hash of the vertices (see poly.polygon_key), which
+# keeps the index small; vertices holds them in the binary format of vertices.py.
+RESULTS_SCHEMA = """(
+                    tested_radius REAL,
+                    sides INTEGER,
+                    real_radius REAL,
+                    max_diff REAL,
+                    max_width INTEGER,
+                    diameter INTEGER,
+                    circularity REAL,
+                    vertices BLOB,
+                    odd_center INTEGER,
+                    uniformity REAL,
+                    max_tested_radius REAL,
+                    polygon_key INTEGER,
+                    UNIQUE(polygon_key, odd_center)
+                )"""
+
+def ensure_schema(c):
+    """
+    Creates the results table if needed and upgrades tables written by older versions.
+    """
+    c.execute("CREATE TABLE IF NOT EXISTS results " + RESULTS_SCHEMA)
+    existing_columns = {row[1] for row in c.execute("PRAGMA table_info(results)")}
+    if "max_tested_radius" not in existing_columns:
+        # Exclusive upper bound of the radius interval that produces the polygon (NULL for old rows)
+        c.execute("ALTER TABLE results ADD COLUMN max_tested_radius REAL")
+    if "vertices" not in existing_columns:
+        upgrade_results(c)
+    # Radius intervals [start_radius, end_radius) already swept at every critical radius with these settings
+    c.execute("""CREATE TABLE IF NOT EXISTS coverage (
+                    odd_center INTEGER,
+                    check_dimensions INTEGER,
+                    difference_threshold REAL,
+                    start_radius REAL,
+                    end_radius REAL
+                )""")
+
+def upgrade_results(c):
+    """
+    Rebuilds a results table that stores its polygons as grid_points text. Its UNIQUE(grid_points, odd_center), if
+    any, can only be dropped by recreating the table. Rows go in smallest tested radius first, so that one is kept
+    if two rows turn out to be the same polygon. Run VACUUM afterwards to give the space back (see migrate.py).
+    """
+    c.execute("CREATE TABLE results_upgraded " + RESULTS_SCHEMA)
+    rows = c.execute("""SELECT tested_radius, sides, real_radius, max_diff, max_width, diameter, circularity, grid_points, odd_center, uniformity, max_tested_radius
+                        FROM results ORDER BY tested_radius""").fetchall()
+
+    def upgrade(row):
+        polygon = parse_grid_points(row[7])
+        return row[:7] + (encode_vertices(polygon, row[8]),) + row[8:] + (polygon_key(polygon),)
+
+    c.executemany("""INSERT INTO results_upgraded (tested_radius, sides, real_radius, max_diff, max_width, diameter, circularity, vertices, odd_center, uniformity, max_tested_radius, polygon_key)
+                     VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                     ON CONFLICT(polygon_key, odd_center) DO NOTHING""",
+                  (upgrade(row) for row in rows))
+    c.execute("DROP TABLE results")
+    c.execute("ALTER TABLE results_upgraded RENAME TO results")
+
+def record_coverage(c, odd_center_val, check_dimensions_flag, difference_threshold, start_radius, end_radius):
+    c.execute("INSERT INTO coverage (odd_center, check_dimensions, difference_threshold, start_radius, end_radius) VALUES (?, ?, ?, ?, ?)",
+              (odd_center_val, 1 if check_dimensions_flag else 0, difference_threshold, start_radius, end_radius))
+
+def load_coverage(odd_center_val, check_dimensions_flag, difference_threshold, database_path=DATABASE_PATH):
+    """
+    Sorted, merged [start, end) radius intervals already swept with these settings, for sweep.skip_covered.
+    """
+    if not os.path.exists(database_path):
+        return []
+    conn = sqlite3.connect(database_path)
+    try:
+        rows = conn.execute("""SELECT start_radius, end_radius FROM coverage
+                               WHERE odd_center = ? AND check_dimensions = ? AND difference_threshold = ?
+                               ORDER BY start_radius""",
+                            (odd_center_val, 1 if check_dimensions_flag else 0, difference_threshold)).fetchall()
+    except sqlite3.OperationalError:
+        rows = []  # Written before coverage was tracked
+    finally:
+        conn.close()
+
+    merged = []
+    for start_radius, end_radius in rows:
+        if merged and start_radius <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end_radius)
+        else:
+            merged.append([start_radius, end_radius])
+    return [tuple(interval) for interval in merged]
+
+# Polygon-derived columns are refreshed, tested_radius only ever goes down. Rows written before the interval was
+# tracked are also updated so their max_tested_radius gets filled in.
+UPSERT_SQL = """INSERT INTO results (tested_radius, sides, real_radius, max_diff, max_width, diameter, circularity, vertices, odd_center, uniformity, max_tested_radius, polygon_key)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(polygon_key, odd_center) DO UPDATE SET
+                    tested_radius = min(results.tested_radius, excluded.tested_radius), vertices = excluded.vertices,
+                    sides = excluded.sides, real_radius = excluded.real_radius, max_diff = excluded.max_diff,
+                    max_width = excluded.max_width, diameter = excluded.diameter, circularity = excluded.circularity,
+                    uniformity = excluded.uniformity, max_tested_radius = excluded.max_tested_radius
+                WHERE excluded.tested_radius < results.tested_radius OR results.max_tested_radius IS NULL"""
+
+def connect(database_path=DATABASE_PATH):
+    """
+    Opens the results database for writing: WAL so readers aren't blocked by the sweep, and a relaxed sync since a
+    lost last transaction only means recomputing a few radii.
+    """
+    conn = sqlite3.connect(database_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-65536")  # 64 MiB
+    return conn
+
+def close(conn):
+    """
+    Switches the database back out of WAL before closing, so the file can be shipped as is (read-only copies and
+    sql.js in index.html can't use the -wal/-shm files).
+    """
+    conn.rollback()  # Nothing left after a commit; drops a batch that failed halfway
+    try:
+        conn.execute("PRAGMA journal_mode=DELETE")
+    except sqlite3.OperationalError:
+        pass  # Another connection (e.g. the viewer) still has it open; it stays in WAL until the next write
+    conn.close()
+
+def encode_polygon(polygon, odd_center_val):
+    """
+    The (vertices, polygon_key) columns of a polygon. The sweep's workers call it on their own transitions, so the
+    single writer thread doesn't have to.
+    """
+    return encode_vertices(polygon, odd_center_val), polygon_key(polygon)
+
+def upsert_results(c, results, odd_center_val, encoded=None):
+    """
+    Writes results (compute tuples plus max_tested_radius) through cursor c in a single executemany, keeping the
+    smallest tested radius for each polygon. encoded has each result's encode_polygon, when it is already known;
+    otherwise it is worked out here. Does not commit.
+    """
+    if encoded is None:
+        encoded = [encode_polygon(res[7], odd_center_val) for res in results]
+    c.executemany(UPSERT_SQL, ((tested_radius, sides, real_radius, max_diff, max_width, diameter, circularity,
+                                vertices, odd_center_val, uniformity, max_tested_radius, key)
+                               for (tested_radius, sides, real_radius, max_diff, max_width, diameter, circularity, _, uniformity, max_tested_radius), (vertices, key)
+                               in zip(results, encoded)))
+
+def load_results(odd_center_vals, min_radius, max_radius, difference_threshold, limit, database_path=DATABASE_PATH):
+    """
+    Rows of these parities first found at a radius in [min_radius, max_radius] and within difference_threshold,
+    fewest sides first: at most limit of them, each as (tested_radius, sides, real_radius, max_diff, max_width,
+    diameter, circularity, vertices, odd_center, uniformity) with the vertices still encoded, plus the number of
+    matching rows in all.
+    """
+    placeholders = ",".join("?" * len(odd_center_vals))
+    where = f"WHERE odd_center IN ({placeholders}) AND tested_radius BETWEEN ? AND ? AND max_diff <= ?"
+    parameters = (*odd_center_vals, min_radius, max_radius, difference_threshold)
+    conn = sqlite3.connect(database_path)
+    try:
+        rows = conn.execute(f"""SELECT tested_radius, sides, real_radius, max_diff, max_width, diameter, circularity, vertices, odd_center, uniformity
+                                FROM results {where} ORDER BY sides, tested_radius LIMIT ?""", parameters + (limit,)).fetchall()
+        total = conn.execute(f"SELECT COUNT(*) FROM results {where}", parameters).fetchone()[0]
+    finally:
+        conn.close()
+    return rows, total
+
+class ResultWriter:
+    """
+    Saves results from a background thread while the sweep is still running. Rows are committed every
+    WRITER_BATCH_ROWS rows or WRITER_FLUSH_SECONDS seconds, whichever comes first, so finished work survives a crash
+    and the database can be read mid-sweep. The queue is bounded, so a slow disk holds back the sweep instead of
+    piling results up in memory.
+    coverage_key is (check_dimensions_flag, difference_threshold); when given, intervals passed to write() are
+    recorded as covered in the same transaction as their results. Every write() names its center parity, so one
+    writer can take both parities of a sweep.
+    """
+    def __init__(self, database_path=DATABASE_PATH, coverage_key=None):
+        self.database_path = database_path
+        self.coverage_key = coverage_key
+        self.rows_written = 0
+        self.write_time = 0.0
+        self.error = None
+        self._queue = queue.Queue(maxsize=WRITER_QUEUE_SIZE)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write(self, odd_center_val, results, covered=None, encoded=None):
+        """
+        Queues results for saving. covered is the (start, end) radius interval they complete, if any; encoded is as
+        for upsert_results.
+        """
+        if self.error is not None:
+            raise self.error
+        if results or (covered is not None and self.coverage_key is not None):
+            self._queue.put((odd_center_val, list(results), covered, encoded))
+
+    def rows_per_second(self):
+        return self.rows_written / self.write_time if self.write_time > 0 else 0
+
+    def close(self):
+        """
+        Commits whatever is still queued and waits for the writer thread. Re-raises a write error, if any.
+        """
+        self._queue.put(None)
+        self._thread.join()
+        if self.error is not None:
+            raise self.error
+
+    def _run(self):
+        conn = None
+        pending = 0
+        last_commit = time.monotonic()
+        try:
+            # Inside the try, so a database that can't be opened is reported by write() and close() too
+            conn = connect(self.database_path)
+            c = conn.cursor()
+            ensure_schema(c)
+            conn.commit()
+            while True:
+                try:
+                    item = self._queue.get(timeout=WRITER_FLUSH_SECONDS)
+                except queue.Empty:
+                    item = (0, [], None, None)
+                if item is None:
+                    break
+                odd_center_val, results, covered, encoded = item
+                start = time.perf_counter()
+                upsert_results(c, results, odd_center_val, encoded)
+                if covered is not None and self.coverage_key is not None:
+                    record_coverage(c, odd_center_val, *self.coverage_key, *covered)
+                pending += len(results)
+                if pending >= WRITER_BATCH_ROWS or (pending and time.monotonic() - last_commit >= WRITER_FLUSH_SECONDS):
+                    conn.commit()
+                    self.rows_written += pending
+                    pending = 0
+                    last_commit = time.monotonic()
+                self.write_time += time.perf_counter() - start
+            start = time.perf_counter()
+            conn.commit()
+            self.rows_written += pending
+            self.write_time += time.perf_counter() - start
+        except Exception as e:
+            self.error = e
+            # Keep draining so the sweep doesn't block on a full queue; write() reports the error
+            while self._queue.get() is not None:
+                pass
+        finally:
+            if conn is not None:
+                close(conn)
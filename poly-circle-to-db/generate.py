@@ -0,0 +1,138 @@
+import argparse
+import json
+import os
+import signal
+import sqlite3
+import sys
+import time
+from poly import compute_for_radius_symmetric, filter_order
+from database import DATABASE_PATH
+from sweep import SweepControl, check_config, plan_sweeps, sweep_to_database, format_utilisation
+from telemetry import ProgressChannel, format_progress, format_stage_times
+from constants import DEFAULT_CONFIG
+from profiling import PROFILE_ENV
+from memory import MEMORY_ENV, format_memory
+
+# Headless counterpart of poly-circle-to-db.py for batch runs: same sweep, same results table, no GUI imports.
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Sweep circle radii and save the distinct grid polygons to a results database.")
+    parser.add_argument("--initial-radius", type=float, default=DEFAULT_CONFIG["INITIAL_RADIUS"])
+    parser.add_argument("--max-radius", type=float, default=DEFAULT_CONFIG["MAX_RADIUS"])
+    parser.add_argument("--increment", type=float, default=DEFAULT_CONFIG["RADIUS_INCREMENT"],
+                        help="Radius step, only used with --fixed-step")
+    parser.add_argument("--odd-center", action="store_true", default=DEFAULT_CONFIG["ODD_CENTER"],
+                        help="Center the circle on (0.5, 0.5) instead of (0, 0)")
+    parser.add_argument("--both-centers", action="store_true", default=DEFAULT_CONFIG["BOTH_CENTERS"],
+                        help="Sweep both centers in one run, sharing the worker pool and database writer")
+    parser.add_argument("--no-check-dimensions", dest="check_dimensions", action="store_false",
+                        default=DEFAULT_CONFIG["CHECK_DIMENSIONS"],
+                        help="Keep polygons whose edges can't be built from 8x8 wedges")
+    parser.add_argument("--fixed-step", dest="critical_radii", action="store_false",
+                        default=DEFAULT_CONFIG["CRITICAL_RADII"],
+                        help="Step the radius by --increment instead of only testing critical radii")
+    parser.add_argument("--difference-threshold", type=float, default=DEFAULT_CONFIG["DIFFERENCE_THRESHOLD"])
+    parser.add_argument("--filter-order", type=lambda text: tuple(text.split(",")), default=DEFAULT_CONFIG["FILTER_ORDER"],
+                        help="Comma-separated order of the rejection tests (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_CONFIG["WORKERS"])
+    parser.add_argument("--no-resume", dest="resume", action="store_false", default=DEFAULT_CONFIG["RESUME"],
+                        help="Recompute radii the database already covers for these settings")
+    parser.add_argument("--output", default=DATABASE_PATH, help="Results database path")
+    parser.add_argument("--profile", metavar="DIR", default=os.environ.get(PROFILE_ENV),
+                        help=f"Profile every worker and write the merged reports to DIR (same as setting {PROFILE_ENV})")
+    parser.add_argument("--memory", action="store_true", default=bool(os.environ.get(MEMORY_ENV)),
+                        help=f"Record peak memory and top allocators per radius band, slow (same as setting {MEMORY_ENV})")
+    parser.add_argument("--report", metavar="PATH", help="Write the run's settings and statistics to this JSON file")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        check_config(args.initial_radius, args.max_radius, args.increment, args.difference_threshold, args.workers)
+        filter_order(args.filter_order)
+    except ValueError as ve:
+        sys.exit(f"Invalid input: {ve}")
+
+    center = 0.5 if args.odd_center else 0.0
+    config = {
+        "ODD_CENTER": args.odd_center,
+        "BOTH_CENTERS": args.both_centers,
+        "CENTER_X": center,
+        "CENTER_Y": center,
+        "INITIAL_RADIUS": args.initial_radius,
+        "MAX_RADIUS": args.max_radius,
+        "RADIUS_INCREMENT": args.increment,
+        "CHECK_DIMENSIONS": args.check_dimensions,
+        "CRITICAL_RADII": args.critical_radii,
+        "DIFFERENCE_THRESHOLD": args.difference_threshold,
+        "FILTER_ORDER": args.filter_order,
+        "WORKERS": args.workers,
+        "RESUME": args.resume
+    }
+
+    if args.profile:
+        os.environ[PROFILE_ENV] = args.profile  # Inherited by the worker processes
+    if args.memory:
+        os.environ[MEMORY_ENV] = "1"
+
+    plans, planned = plan_sweeps(config, args.output)
+    total = sum(len(radii) for _, radii, _ in plans)
+    if planned > total:
+        print(f"Skipping {planned - total} of {planned} radii already covered in {args.output}", file=sys.stderr)
+    if total == 0:
+        print("Nothing to compute", file=sys.stderr)
+        return
+    start = time.perf_counter()
+
+    progress = ProgressChannel(total)
+    progress.subscribe(lambda snapshot: print(f"\r{format_progress(snapshot)}", end="", file=sys.stderr, flush=True))
+
+    control = SweepControl()
+
+    def on_interrupt(signum, frame):
+        # The first Ctrl+C stops the sweep and keeps what it computed, a second one aborts
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        print("\nCancelling, saving the results computed so far (Ctrl+C again to abort)", file=sys.stderr)
+        control.cancel()
+
+    signal.signal(signal.SIGINT, on_interrupt)
+
+    # Results go straight to the database as each range finishes, nothing is kept in memory
+    try:
+        stats, writer = sweep_to_database(compute_for_radius_symmetric, plans, args.output, progress=progress, control=control)
+    except sqlite3.Error as e:
+        sys.exit(f"\nCould not save to {args.output}: {e}")
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+
+    elapsed = time.perf_counter() - start
+    print(file=sys.stderr)
+    if stats["cancelled"]:
+        print(f"Cancelled after {progress.radii_done} of {total} radii; run again to resume", file=sys.stderr)
+    print(f"{writer.rows_written} polygon rows from {progress.radii_done} radii in {elapsed:.2f}s "
+          f"({progress.radii_done / elapsed if elapsed > 0 else 0:.0f} radii/s), saved to {args.output}", file=sys.stderr)
+    print(f"Database writes: {writer.rows_per_second():.0f} rows/s", file=sys.stderr)
+    print(f"Stage times: {format_stage_times(progress.snapshot())}", file=sys.stderr)
+    print(format_utilisation(stats), file=sys.stderr)
+    if stats.get("profile"):
+        print(f"Profile: {' and '.join(stats['profile'])}", file=sys.stderr)
+    if stats.get("memory"):
+        print(format_memory(stats["memory"]), file=sys.stderr)
+
+    if args.report:
+        report = {
+            "config": config,
+            "output": args.output,
+            "planned_radii": planned,
+            "radii": total,
+            "radii_done": progress.radii_done,
+            "rows_written": writer.rows_written,
+            "elapsed": elapsed,
+            "database_rows_per_second": writer.rows_per_second(),
+            "stats": stats
+        }
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report: {args.report}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+import math
+from array import array
+from bisect import bisect_right
+from multiprocessing import shared_memory
+from poly import inside_limit, octant_columns
+
+# Octant lattice tables shared by a sweep's worker processes. For a center on the grid's diagonal, every grid point
+# in the octant 0 <= U <= V (doubled coordinates, see poly.inside_limit) is listed once, nearest first, so the
+# points inside any radius are a prefix of the table. The parent builds the table once per sweep in shared memory
+# and the workers map it, so nobody re-tests points and nothing is copied per worker.
+
+ITEM_SIZE = 8  # Bytes per int64 entry
+
+class LatticeTable:
+    """
+    Three int64 columns over one shared memory block: squared distances, then the U and then the V coordinates of
+    the octant's points. Create it with LatticeTable.create in the parent and pass spec to LatticeTable.attach in
+    the workers.
+    """
+    def __init__(self, memory, count, offset, max_limit, owner):
+        self.memory = memory
+        self.count = count
+        self.offset = offset
+        self.max_limit = max_limit
+        self.owner = owner
+        values = memory.buf.cast("q")
+        self.squared = values[:count]
+        self.U = values[count:2 * count]
+        self.V = values[2 * count:3 * count]
+        self._values = values
+
+    @classmethod
+    def create(cls, center_x, max_radius):
+        offset = round(2 * center_x)
+        max_limit = inside_limit(center_x, center_x, max_radius)
+        # Each point packed into one int, squared distance first, so sorting sorts by distance. A list of ints takes
+        # about a third of the memory of a list of (squared, U, V) tuples, which matters at large radii.
+        bits = math.isqrt(max_limit).bit_length()
+        mask = (1 << bits) - 1
+        keys = []
+        for U in range(offset, math.isqrt(max_limit) + 1, 2):
+            UU = U * U
+            head = U << bits
+            keys.extend((UU + V * V) << (2 * bits) | head | V for V in range(U, math.isqrt(max_limit - UU) + 1, 2))
+        keys.sort()
+
+        values = array("q", (key >> (2 * bits) for key in keys))
+        values.extend(key >> bits & mask for key in keys)
+        values.extend(key & mask for key in keys)
+        count = len(keys)
+        del keys
+        memory = shared_memory.SharedMemory(create=True, size=max(1, len(values)) * ITEM_SIZE)
+        memory.buf[:len(values) * ITEM_SIZE] = values.tobytes()
+        return cls(memory, count, offset, max_limit, owner=True)
+
+    @property
+    def spec(self):
+        return self.memory.name, self.count, self.offset, self.max_limit
+
+    @classmethod
+    def attach(cls, spec):
+        name, count, offset, max_limit = spec
+        return cls(shared_memory.SharedMemory(name=name), count, offset, max_limit, owner=False)
+
+    def close(self):
+        """
+        Unmaps the table; the process that created it also frees the block.
+        """
+        for view in (self.squared, self.U, self.V, self._values):
+            view.release()
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
+
+class ColumnTops:
+    """
+    poly.octant_columns for ascending limits, kept up to date from a LatticeTable: moving to a larger limit only
+    visits the points that entered the circle since the previous one. A new point is always the top of its column,
+    and a column starts when its diagonal point (U, U) comes in.
+    """
+    def __init__(self, table, limit):
+        self.table = table
+        self.columns = octant_columns(table.offset, limit)
+        self.position = bisect_right(table.squared, limit)
+
+    def advance(self, limit):
+        """
+        Columns for limit, which must not be smaller than the previous one. The list is the cursor's own and changes
+        on the next call.
+        """
+        table = self.table
+        end = bisect_right(table.squared, limit, self.position)
+        columns = self.columns
+        offset = table.offset
+        for index in range(self.position, end):
+            U = table.U[index]
+            column = (U - offset) // 2
+            if column == len(columns):
+                columns.append((U, table.V[index]))
+            else:
+                columns[column] = (U, table.V[index])
+        self.position = end
+        return columns
@@ -0,0 +1,113 @@
+import os
+import sys
+import tracemalloc
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Opt-in memory instrumentation for sweeps. Set POLY_MEMORY (generate.py --memory does) and the workers and the
+# parent record, per radius band, the peak of the memory tracemalloc traced, the process' peak RSS so far and the
+# allocation sites holding the most memory. Grouping a snapshot by site takes about a second once the process holds
+# many results, so each process only snapshots a band the first time it records it. Workers record the bands of
+# the radii they compute, the parent the band of each range it receives. run_sweeps puts them in stats["memory"].
+# With one worker both run in the same process and share tracemalloc's peak. Tracing slows Python down
+# considerably, so keep it for sizing runs.
+
+MEMORY_ENV = "POLY_MEMORY"
+MEMORY_BAND_WIDTH = 25  # Radius units per band
+TOP_ALLOCATORS = 5
+
+# This process' top allocators by band, for the current sweep (see start_memory_run)
+_top_by_band = {}
+
+def memory_enabled():
+    return bool(os.environ.get(MEMORY_ENV))
+
+def start_memory_run():
+    """
+    Called by the parent before a sweep, so the top allocators of a previous sweep aren't reused.
+    """
+    _top_by_band.clear()
+
+def radius_band(radius):
+    start = int(radius // MEMORY_BAND_WIDTH) * MEMORY_BAND_WIDTH
+    return f"{start}-{start + MEMORY_BAND_WIDTH}"
+
+def peak_rss():
+    """
+    Peak resident set size of this process in bytes, or None where the resource module is missing.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024  # Bytes on macOS, KiB elsewhere
+
+def top_allocators(limit=TOP_ALLOCATORS):
+    # Dropping tracemalloc's own lines afterwards is much cheaper than Snapshot.filter_traces
+    stats = [stat for stat in tracemalloc.take_snapshot().statistics("lineno") if stat.traceback[0].filename != tracemalloc.__file__]
+    return [{"where": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}", "size": stat.size, "count": stat.count}
+            for stat in stats[:limit]]
+
+class MemoryRecorder:
+    """
+    Collects one record per radius band for the calling process: {band: {"traced_peak", "rss_peak", "top"}}.
+    record(band) covers the time since the previous record. Starts tracemalloc if it isn't running; stop() only
+    stops it then.
+    """
+    def __init__(self):
+        self.bands = {}
+        self.started = not tracemalloc.is_tracing()
+        if self.started:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+
+    def record(self, band):
+        _, traced_peak = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        if band not in _top_by_band:
+            _top_by_band[band] = top_allocators()
+        merge_records(self.bands, {band: {"traced_peak": traced_peak, "rss_peak": peak_rss(), "top": _top_by_band[band]}})
+
+    def stop(self):
+        if self.started:
+            tracemalloc.stop()
+
+def merge_records(target, bands):
+    """
+    Merges {band: record} into target, keeping each band's highest peaks and the allocators recorded with the
+    highest traced peak.
+    """
+    for band, record in bands.items():
+        current = target.get(band)
+        if current is None or record["traced_peak"] > current["traced_peak"]:
+            rss_peak = record["rss_peak"] if current is None else max_rss(current["rss_peak"], record["rss_peak"])
+            target[band] = dict(record, rss_peak=rss_peak)
+        else:
+            current["rss_peak"] = max_rss(current["rss_peak"], record["rss_peak"])
+
+def max_rss(a, b):
+    return b if a is None else a if b is None else max(a, b)
+
+def format_memory(memory):
+    """
+    One line per radius band: the parent's and the largest worker's traced peak and peak RSS, in MiB.
+    """
+    def mib(value):
+        return f"{value / 2 ** 20:.1f}" if value is not None else "?"
+
+    bands = set(memory["parent"])
+    for worker in memory["workers"].values():
+        bands.update(worker)
+    lines = []
+    for band in sorted(bands, key=lambda band: float(band.split("-")[0])):
+        parent = memory["parent"].get(band)
+        workers = [worker[band] for worker in memory["workers"].values() if band in worker]
+        line = f"Radius {band}:"
+        if parent is not None:
+            line += f" parent traced {mib(parent['traced_peak'])} MiB, RSS {mib(parent['rss_peak'])} MiB;"
+        if workers:
+            line += (f" workers traced {mib(max(worker['traced_peak'] for worker in workers))} MiB, "
+                     f"RSS {mib(max((worker['rss_peak'] for worker in workers if worker['rss_peak'] is not None), default=None))} MiB")
+        lines.append(line.rstrip(";"))
+    return "\n".join(lines)
@@ -0,0 +1,35 @@
+import argparse
+import os
+import sqlite3
+import sys
+from database import DATABASE_PATH, ensure_schema
+
+# Upgrades results databases written by older versions to the current schema (polygon keys, binary vertices) and
+# compacts them. The generator upgrades on its next write anyway; this also runs VACUUM so the file shrinks.
+
+def migrate(database_path):
+    """
+    Upgrades and compacts one database. Returns its size in bytes before and after.
+    """
+    size_before = os.path.getsize(database_path)
+    conn = sqlite3.connect(database_path)
+    c = conn.cursor()
+    ensure_schema(c)
+    conn.commit()
+    conn.execute("VACUUM")
+    conn.close()
+    return size_before, os.path.getsize(database_path)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Upgrade results databases to the current schema and compact them.")
+    parser.add_argument("paths", nargs="*", default=[DATABASE_PATH], help="Databases to migrate (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    for path in args.paths:
+        if not os.path.exists(path):
+            sys.exit(f"{path} does not exist")
+        size_before, size_after = migrate(path)
+        print(f"{path}: {size_before / 1024:.0f} KiB -> {size_after / 1024:.0f} KiB")
+
+if __name__ == "__main__":
+    main()
@@ -11,122 +11,24 @@ import pandas as pd
 import os
 import threading
 import math
-from math import gcd
-from multiprocessing import Pool, cpu_count
-import sqlite3
-
-MAX_CPU_CORES = 4
+from multiprocessing import cpu_count
+from poly import distance_to_center, sort_grid_points, compute_for_radius_symmetric
+from sweep import SweepControl, check_config, plan_sweeps, sweep_to_database, format_utilisation
+from database import load_results
+from vertices import decode_vertices
+from telemetry import ProgressChannel, format_progress, format_stage_times
+from constants import DEFAULT_CONFIG
 
 matplotlib.use("TkAgg")
 
-# Default Configuration Constants
-DEFAULT_CONFIG = {
-    "ODD_CENTER": False,          # If True, center = (0.5, 0.5); if False, center = (0, 0)
-    "INITIAL_RADIUS": 5,
-    "RADIUS_INCREMENT": 0.0025,
-    "MAX_RADIUS": 40,
-    "CHECK_DIMENSIONS": True,
-    "DIFFERENCE_THRESHOLD": 0.5
-}
+# Most rows the results table shows after a sweep. Large radii give hundreds of thousands of polygons of hundreds of
+# vertices each, so the sweep only writes them to the database and the table loads this many back, vertices encoded.
+TABLE_ROW_LIMIT = 5000
 
 overlay_lines = []
 overlay_texts = []
 overlay_visible = False
 
-def distance_to_center(center_x, center_y, grid_x, grid_y):
-    return np.sqrt((grid_x - center_x)**2 + (grid_y - center_y)**2)
-
-def cross(o, a, b):
-    return (a[0]-o[0])*(b[1]-o[1]) - (a[1]-o[1])*(b[0]-o[0])
-
-def convex_hull(points):
-    points = sorted(points)
-    if len(points) <= 1:
-        return points
-
-    lower = []
-    for p in points:
-        while len(lower) >= 2 and cross(lower[-2], lower[-1], p) <= 0:
-            lower.pop()
-        lower.append(p)
-
-    upper = []
-    for p in reversed(points):
-        while len(upper) >= 2 and cross(upper[-2], upper[-1], p) <= 0:
-            upper.pop()
-        upper.append(p)
-
-    return lower[:-1] + upper[:-1]
-
-def is_collinear(a, b, c):
-    return cross(a, b, c) == 0
-
-def is_between(a, b, c):
-    return (min(a[0], c[0]) <= b[0] <= max(a[0], c[0])) and \
-           (min(a[1], c[1]) <= b[1] <= max(a[1], c[1]))
-
-def remove_collinear_points(points):
-    if len(points) < 3:
-        return points
-
-    changed = True
-    while changed:
-        changed = False
-        new_points = []
-        n = len(points)
-        for i in range(n):
-            prev_p = points[(i - 1) % n]
-            curr_p = points[i]
-            next_p = points[(i + 1) % n]
-
-            if is_collinear(prev_p, curr_p, next_p) and is_between(prev_p, curr_p, next_p):
-                changed = True
-            else:
-                new_points.append(curr_p)
-        points = new_points
-        if len(points) < 3:
-            break
-
-    return points
-
-def sort_grid_points(center_x, center_y, grid_points):
-    def calculate_angle(point):
-        x, y = point
-        angle = np.arctan2(y - center_y, x - center_x)
-        return angle if angle >= 0 else (2 * np.pi + angle)
-    return sorted(grid_points, key=calculate_angle)
-
-def check_dimensions(center_x, center_y, radius, grid_points):
-    sorted_points = sort_grid_points(center_x, center_y, grid_points)
-    num_points = len(sorted_points)
-
-    for i in range(num_points):
-        current_point = sorted_points[i]
-        next_point = sorted_points[(i + 1) % num_points]
-
-        delta_x = abs(next_point[0] - current_point[0])
-        delta_y = abs(next_point[1] - current_point[1])
-
-        # Condition 1
-        if delta_x == 0 or delta_y == 0 or delta_x == delta_y:
-            continue
-
-        # Condition 2
-        if delta_x <= 8 and delta_y <= 8:
-            continue
-
-        # Condition 3
-        common_divisor = gcd(delta_x, delta_y)
-        if common_divisor > 1:
-            simplified_x = delta_x // common_divisor
-            simplified_y = delta_y // common_divisor
-            if simplified_x <= 8 and simplified_y <= 8:
-                continue
-
-        return False
-
-    return True
-
 def create_overlay(ax, center_x, center_y, grid_points):
     global overlay_lines, overlay_texts
     overlay_lines.clear()
@@ -189,24 +91,6 @@ def toggle_overlay(canvas):
         artist.set_visible(overlay_visible)
     canvas.draw()
 
-def shoelace_area(polygon):
-    n = len(polygon)
-    area = 0.0
-    for i in range(n):
-        x0, y0 = polygon[i]
-        x1, y1 = polygon[(i + 1) % n]
-        area += (x0 * y1) - (x1 * y0)
-    return abs(area) / 2.0
-
-def polygon_perimeter(polygon):
-    perimeter = 0.0
-    n = len(polygon)
-    for i in range(n):
-        x0, y0 = polygon[i]
-        x1, y1 = polygon[(i + 1) % n]
-        perimeter += math.hypot(x1 - x0, y1 - y0)
-    return perimeter
-
 def create_plot(center_x, center_y, tested_radius, sides, real_radius, max_diff, diameter, circularity, max_width, grid_points, uniformity):
     fig = plt.Figure(figsize=(8, 8))
     gs = GridSpec(1, 1, figure=fig)
@@ -267,10 +151,11 @@ def on_row_selected(event, tree, canvas_frame, config):
     if not data_tuple:
         return
 
-    tested_radius, sides, real_radius, max_diff, max_width, diameter, circularity, polygon, odd_center_val, uniformity = data_tuple
+    tested_radius, sides, real_radius, max_diff, max_width, diameter, circularity, vertices, odd_center_val, uniformity = data_tuple
+    polygon = decode_vertices(vertices)
 
-    # Determine center based on ODD_CENTER
-    if config["ODD_CENTER"]:
+    # The row's own center: a sweep of both centers lists polygons of either parity
+    if odd_center_val:
         center_x, center_y = 0.5, 0.5
     else:
         center_x, center_y = 0.0, 0.0
@@ -339,23 +224,15 @@ def sort_treeview(tree, col, reverse, sort_order):
     sort_order[col] = not reverse
     tree.heading(col, text=tree.heading(col)['text'], command=lambda: sort_treeview(tree, col, sort_order[col], sort_order))
 
-def get_user_inputs(entries_circle, entries_thresholds, check_dimensions_var, odd_center_var):
+def get_user_inputs(entries_circle, entries_thresholds, check_dimensions_var, odd_center_var, both_centers_var, critical_radii_var, resume_var, workers_spin):
     try:
         initial_radius = float(entries_circle["INITIAL_RADIUS"].get())
         max_radius = float(entries_circle["MAX_RADIUS"].get())
         radius_increment = float(entries_thresholds["RADIUS_INCREMENT"].get())
         difference_threshold = float(entries_thresholds["DIFFERENCE_THRESHOLD"].get())
+        workers = int(workers_spin.get())
 
-        if not (1 <= initial_radius <= 199):
-            raise ValueError("Initial Radius must be between 1 and 199.")
-        if not (2 <= max_radius <= 200):
-            raise ValueError("Max Radius must be between 2 and 200.")
-        if initial_radius > max_radius:
-            raise ValueError("Initial Radius cannot be greater than Max Radius.")
-        if difference_threshold < 0:
-            raise ValueError("Difference Threshold cannot be negative.")
-        if radius_increment <= 0:
-            raise ValueError("Radius Increment must be positive.")
+        check_config(initial_radius, max_radius, radius_increment, difference_threshold, workers)
 
         # Determine center based on ODD_CENTER
         if odd_center_var.get():
@@ -365,204 +242,94 @@ def get_user_inputs(entries_circle, entries_thresholds, check_dimensions_var, od
 
         return {
             "ODD_CENTER": odd_center_var.get(),
+            "BOTH_CENTERS": both_centers_var.get(),
             "CENTER_X": center_x,
             "CENTER_Y": center_y,
             "INITIAL_RADIUS": initial_radius,
             "MAX_RADIUS": max_radius,
             "RADIUS_INCREMENT": radius_increment,
             "CHECK_DIMENSIONS": check_dimensions_var.get(),
-            "DIFFERENCE_THRESHOLD": difference_threshold
+            "CRITICAL_RADII": critical_radii_var.get(),
+            "RESUME": resume_var.get(),
+            "DIFFERENCE_THRESHOLD": difference_threshold,
+            "FILTER_ORDER": DEFAULT_CONFIG["FILTER_ORDER"],
+            "WORKERS": workers
         }
     except ValueError as ve:
         messagebox.showerror("Invalid Input", str(ve))
         return None
 
-def compute_for_radius(args):
-    center_x, center_y, radius, check_dimensions_flag, difference_threshold = args
-
-    min_x = int(np.floor(center_x - radius))
-    max_x = int(np.ceil(center_x + radius))
-    min_y = int(np.floor(center_y - radius))
-    max_y = int(np.ceil(center_y + radius))
-
-    inside_points = []
-    for gx in range(min_x, max_x+1):
-        for gy in range(min_y, max_y+1):
-            if distance_to_center(center_x, center_y, gx, gy) <= radius:
-                inside_points.append((gx, gy))
-
-    if len(inside_points) < 3:
-        return None
-
-    hull = convex_hull(inside_points)
-    if len(hull) < 3:
-        return None
+def on_calculate_click(entries_circle, entries_thresholds, check_dimensions_var, tree, canvas_frame, progress_bar, calculate_button, odd_center_var, both_centers_var, critical_radii_var, resume_var, workers_spin, status_label, pause_button, cancel_button):
+    config = get_user_inputs(entries_circle, entries_thresholds, check_dimensions_var, odd_center_var, both_centers_var, critical_radii_var, resume_var, workers_spin)
+    if config is None:
+        return
 
-    simplified = remove_collinear_points(hull)
-    if len(simplified) < 3:
-        return None
+    calculate_button.config(state=tk.DISABLED)
+    progress_bar.pack(side=tk.BOTTOM, fill=tk.X, padx=5, pady=5)
+    progress_bar.config(value=0)
 
-    if check_dimensions_flag:
-        if not check_dimensions(center_x, center_y, radius, simplified):
-            return None
+    status_label.config(text="Planning the sweep...")
 
-    # Compute Real Radius (max distance to center)
-    real_radius = max(distance_to_center(center_x, center_y, p[0], p[1]) for p in simplified)
-    # Compute max difference from Real Radius
-    differences = [abs(distance_to_center(center_x, center_y, p[0], p[1]) - real_radius) for p in simplified]
-    max_diff = max(differences)
+    def update_progress(snapshot):
+        progress_bar['value'] = snapshot["radii_done"]
+        status_label.config(text=f"{format_progress(snapshot)}\n{format_stage_times(snapshot)}")
+        progress_bar.update_idletasks()
 
-    # Check difference threshold
-    if max_diff > difference_threshold:
-        return None
+    # Workers check the control between radii; a cancelled sweep still saves what it computed
+    control = SweepControl()
 
-    # Compute Diameter: max_x - min_x
-    x_values = [p[0] for p in simplified]
-    diameter = max(x_values) - min(x_values)
-
-    # Compute Area and Perimeter for Circularity
-    area = shoelace_area(simplified)
-    perimeter = polygon_perimeter(simplified)
-    circularity = (4 * math.pi * area) / (perimeter ** 2) if perimeter > 0 else 0
-
-    # New Feature: Calculate max_width
-    widths = []
-    n = len(simplified)
-    for i in range(n):
-        A = simplified[i]
-        B = simplified[(i + 1) % n]
-        delta_x = abs(B[0] - A[0])
-        delta_y = abs(B[1] - A[1])
-        if delta_x == 0 and delta_y == 0:
-            continue  # Skip if both deltas are zero
-        common_divisor = gcd(delta_x, delta_y) if delta_x and delta_y else max(delta_x, delta_y)
-        if common_divisor == 0:
-            simplified_x, simplified_y = delta_x, delta_y
+    def toggle_pause():
+        if control.paused:
+            control.resume()
+            pause_button.config(text="Pause")
         else:
-            simplified_x = delta_x // common_divisor
-            simplified_y = delta_y // common_divisor
-        width = min(simplified_x, simplified_y)
-        widths.append(width)
-    max_width = max(widths) if widths else 0
-
-    # Calculate Uniformity
-    side_lengths = []
-    for i in range(len(simplified)):
-        A = simplified[i]
-        B = simplified[(i + 1) % len(simplified)]
-        length = math.hypot(B[0] - A[0], B[1] - A[1])
-        side_lengths.append(length)
-
-    if not side_lengths:
-        return None
+            control.pause()
+            pause_button.config(text="Resume")
 
-    average_length = sum(side_lengths) / len(side_lengths)
-    max_length = max(side_lengths)
-    uniformity = average_length / max_length if max_length != 0 else 0
-
-    return (radius, len(simplified), real_radius, max_diff, max_width, diameter, circularity, tuple(simplified), uniformity)
-
-def save_results_to_database(results, odd_center_val):
-    conn = sqlite3.connect("results.db")
-    c = conn.cursor()
-    # Create table if not exists (TODO: should change this so that it's only created once, doing this every iteration is inefficient)
-    c.execute("""CREATE TABLE IF NOT EXISTS results (
-                    tested_radius REAL,
-                    sides INTEGER,
-                    real_radius REAL,
-                    max_diff REAL,
-                    max_width INTEGER,
-                    diameter INTEGER,
-                    circularity REAL,
-                    grid_points TEXT,
-                    odd_center INTEGER,
-                    uniformity REAL,
-                    UNIQUE(grid_points, odd_center)
-                )""")
-    for r in results:
-        tested_radius, sides, real_radius, max_diff, max_width, diameter, circularity, polygon, uniformity = r
-        polygon_str = ",".join(f"({x},{y})" for x, y in polygon)
-
-        # Check if this polygon with the same odd_center already exists
-        c.execute("SELECT tested_radius, sides, real_radius, max_diff, max_width, diameter, circularity, uniformity FROM results WHERE grid_points = ? AND odd_center = ?", (polygon_str, odd_center_val))
-        existing = c.fetchone()
-
-        if existing is not None:
-            # Polygon already in DB with the same odd_center
-            existing_tested_radius, existing_sides, existing_real_radius, existing_max_diff, existing_max_width, existing_diameter, existing_circularity, existing_uniformity = existing
-            # If new tested_radius is smaller, replace the old
-            if tested_radius < existing_tested_radius:
-                c.execute("""UPDATE results SET tested_radius=?, sides=?, real_radius=?, max_diff=?, max_width=?, diameter=?, circularity=?, uniformity=? 
-                             WHERE grid_points=? AND odd_center=?""",
-                          (tested_radius, sides, real_radius, max_diff, max_width, diameter, circularity, uniformity, polygon_str, odd_center_val))
-            # If not smaller, do nothing (no insert)
-        else:
-            # Insert the new record with odd_center, diameter, circularity, max_width, and uniformity
-            c.execute("""INSERT INTO results (tested_radius, sides, real_radius, max_diff, max_width, diameter, circularity, grid_points, odd_center, uniformity) 
-                         VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                      (tested_radius, sides, real_radius, max_diff, max_width, diameter, circularity, polygon_str, odd_center_val, uniformity))
+    def cancel():
+        control.cancel()
+        pause_button.config(text="Pause", state=tk.DISABLED)
+        cancel_button.config(state=tk.DISABLED)
 
-    conn.commit()
-    conn.close()
+    pause_button.config(text="Pause", command=toggle_pause, state=tk.NORMAL)
+    cancel_button.config(command=cancel, state=tk.NORMAL)
 
-def on_calculate_click(entries_circle, entries_thresholds, check_dimensions_var, tree, canvas_frame, progress_bar, calculate_button, odd_center_var):
-    config = get_user_inputs(entries_circle, entries_thresholds, check_dimensions_var, odd_center_var)
-    if config is None:
-        return
+    def finish_sweep():
+        progress_bar.pack_forget()
+        pause_button.config(text="Pause", state=tk.DISABLED)
+        cancel_button.config(state=tk.DISABLED)
+        calculate_button.config(state=tk.NORMAL)
 
-    calculate_button.config(state=tk.DISABLED)
-    progress_bar.pack(side=tk.BOTTOM, fill=tk.X, padx=5, pady=5)
-    progress_bar.config(value=0)
+    def run_computation():
+        # One plan per center parity; with resume, only the radii no earlier run covered. The table lists the
+        # database's polygons in the whole radius range either way. Planning reads the coverage table and walks the
+        # grid, so it runs here rather than on the Tk thread.
+        plans, planned_steps = plan_sweeps(config)
+        total_steps = sum(len(radii) for _, radii, _ in plans)
+        root.after(0, lambda: progress_bar.config(maximum=total_steps))
 
-    initial_radius = config["INITIAL_RADIUS"]
-    max_radius = config["MAX_RADIUS"]
-    radius_increment = config["RADIUS_INCREMENT"]
-    center_x = config["CENTER_X"]
-    center_y = config["CENTER_Y"]
-    check_dimensions_flag = config["CHECK_DIMENSIONS"]
-    difference_threshold = config["DIFFERENCE_THRESHOLD"]
-    odd_center_val = 1 if config["ODD_CENTER"] else 0  # Convert to integer
-
-    radii = []
-    r = initial_radius
-    while r <= max_radius:
-        radii.append(r)
-        r += radius_increment
-
-    total_steps = len(radii)
-    progress_bar.config(maximum=total_steps)
-
-    def update_progress(value):
-        progress_bar['value'] = value
-        progress_bar.update_idletasks()
+        # Throttled to a few updates per second, each handed to the main thread
+        progress = ProgressChannel(total_steps)
+        progress.subscribe(lambda snapshot: root.after(0, update_progress, snapshot))
 
-    def run_computation():
-        results = []
-        count = 0
-        with Pool(processes=min(cpu_count(), 4)) as pool:
-            for res in pool.imap_unordered(compute_for_radius, [(center_x, center_y, rad, check_dimensions_flag, difference_threshold) for rad in radii]):
-                if res is not None:
-                    results.append(res)
-                count += 1
-                # Update progress in main thread
-                root.after(0, update_progress, count)
-
-        # Remove duplicates (based on exact grid points and odd_center)
-        seen_polygons = set()
-        filtered_results = []
-        for res in results:
-            tested_radius, sides, real_radius, max_diff, max_width, diameter, circularity, polygon, uniformity = res
-            if polygon not in seen_polygons:
-                seen_polygons.add(polygon)
-                filtered_results.append(res)
-
-        # Sort by sides ascending
-        filtered_results.sort(key=lambda x: x[1])
-
-        # Save results to database with odd_center_val
-        save_results_to_database(filtered_results, odd_center_val)
+        # Workers only send back polygon transitions, which are saved as each range finishes and not kept here
+        stats, writer = sweep_to_database(compute_for_radius_symmetric, plans, progress=progress, control=control)
+
+        odd_center_vals = [1 if parity_config["ODD_CENTER"] else 0 for parity_config, _, _ in plans]
+        filtered_results, total_rows = load_results(odd_center_vals, config["INITIAL_RADIUS"], config["MAX_RADIUS"],
+                                                    config["DIFFERENCE_THRESHOLD"], TABLE_ROW_LIMIT)
 
         def update_gui():
+            snapshot = progress.snapshot()
+            status = (f"{format_progress(snapshot)}\nStage times: {format_stage_times(snapshot)}\n"
+                      f"{format_utilisation(stats)}\nDatabase writes: {writer.rows_per_second():.0f} rows/s")
+            if planned_steps > total_steps:
+                status += f"\nSkipped {planned_steps - total_steps} of {planned_steps} radii already covered"
+            if stats["cancelled"]:
+                status += f"\nCancelled after {snapshot['radii_done']} of {total_steps} radii, results so far are saved"
+            if total_rows > len(filtered_results):
+                status += f"\nShowing the {len(filtered_results)} polygons with the fewest sides of {total_rows} in the database"
+            status_label.config(text=status)
             for item in tree.get_children():
                 tree.delete(item)
             tree.item_data.clear()
@@ -571,12 +338,11 @@ def on_calculate_click(entries_circle, entries_thresholds, check_dimensions_var,
                 messagebox.showinfo("No Valid Results", "No polygons formed for the given configuration.")
                 for widget in canvas_frame.winfo_children():
                     widget.destroy()
-                progress_bar.pack_forget()
-                calculate_button.config(state=tk.NORMAL)
+                finish_sweep()
                 return
 
             for data_tuple in filtered_results:
-                tested_radius, sides, real_radius, max_diff, max_width, diameter, circularity, polygon, uniformity = data_tuple
+                tested_radius, sides, real_radius, max_diff, max_width, diameter, circularity, vertices, odd_center_val, uniformity = data_tuple
                 odd_center = "Yes" if odd_center_val else "No"
                 iid = tree.insert("", tk.END, values=(
                     f"{tested_radius:.4f}",
@@ -589,7 +355,7 @@ def on_calculate_click(entries_circle, entries_thresholds, check_dimensions_var,
                     f"{uniformity:.4f}",
                     odd_center
                 ))
-                tree.item_data[iid] = (tested_radius, sides, real_radius, max_diff, max_width, diameter, circularity, polygon, odd_center_val, uniformity)
+                tree.item_data[iid] = data_tuple
 
             sort_order = {col: False for col in ("tested_radius", "sides", "real_radius", "max_diff", "max_width", "diameter", "circularity", "uniformity", "odd_center")}
             for col in ("tested_radius", "sides", "real_radius", "max_diff", "max_width", "diameter", "circularity", "uniformity", "odd_center"):
@@ -600,8 +366,7 @@ def on_calculate_click(entries_circle, entries_thresholds, check_dimensions_var,
                 tree.focus(tree.get_children()[0])
                 on_row_selected(None, tree, canvas_frame, config)
 
-            progress_bar.pack_forget()
-            calculate_button.config(state=tk.NORMAL)
+            finish_sweep()
 
         root.after(0, update_gui)
 
@@ -681,15 +446,45 @@ def main():
     odd_center_chk = ttk.Checkbutton(options_frame, text="Odd Center", variable=odd_center_var)
     odd_center_chk.grid(row=0, column=0, padx=5, pady=5, sticky=tk.W)
 
+    # Both Centers Checkbox (sweeps (0, 0) and (0.5, 0.5) in one run, Odd Center is then ignored)
+    both_centers_var = tk.BooleanVar(value=DEFAULT_CONFIG["BOTH_CENTERS"])
+    both_centers_chk = ttk.Checkbutton(options_frame, text="Both Centers", variable=both_centers_var)
+    both_centers_chk.grid(row=0, column=1, padx=5, pady=5, sticky=tk.W)
+
     # Check Dimensions Checkbox
     check_dimensions_var = tk.BooleanVar(value=DEFAULT_CONFIG["CHECK_DIMENSIONS"])
     check_dimensions_chk = ttk.Checkbutton(options_frame, text="Check Dimensions", variable=check_dimensions_var)
     check_dimensions_chk.grid(row=1, column=0, padx=5, pady=5, sticky=tk.W)
 
+    # Critical Radii Checkbox
+    critical_radii_var = tk.BooleanVar(value=DEFAULT_CONFIG["CRITICAL_RADII"])
+    critical_radii_chk = ttk.Checkbutton(options_frame, text="Critical Radii Sweep", variable=critical_radii_var)
+    critical_radii_chk.grid(row=2, column=0, padx=5, pady=5, sticky=tk.W)
+
+    # Skip Covered Radii Checkbox
+    resume_var = tk.BooleanVar(value=DEFAULT_CONFIG["RESUME"])
+    resume_chk = ttk.Checkbutton(options_frame, text="Skip Covered Radii", variable=resume_var)
+    resume_chk.grid(row=3, column=0, padx=5, pady=5, sticky=tk.W)
+
+    # Worker Processes Spinbox
+    workers_label = ttk.Label(options_frame, text="Workers:")
+    workers_label.grid(row=4, column=0, padx=5, pady=5, sticky=tk.W)
+    workers_spin = ttk.Spinbox(options_frame, from_=1, to=cpu_count(), width=5)
+    workers_spin.grid(row=4, column=1, padx=5, pady=5, sticky=tk.W)
+    workers_spin.set(str(DEFAULT_CONFIG["WORKERS"]))
+
     # Calculate Button
     calculate_button = ttk.Button(buttons_frame, text="Calculate")
     calculate_button.pack(side=tk.TOP, fill=tk.X, padx=5, pady=5)
 
+    # Pause/Resume and Cancel Buttons (enabled while a sweep runs)
+    sweep_controls_frame = ttk.Frame(buttons_frame)
+    sweep_controls_frame.pack(side=tk.TOP, fill=tk.X)
+    pause_button = ttk.Button(sweep_controls_frame, text="Pause", state=tk.DISABLED)
+    pause_button.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5, pady=5)
+    cancel_button = ttk.Button(sweep_controls_frame, text="Cancel", state=tk.DISABLED)
+    cancel_button.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5, pady=5)
+
     # Define Treeview Columns
     columns = ("tested_radius", "sides", "real_radius", "max_diff", "max_width", "diameter", "circularity", "uniformity", "odd_center")
 
@@ -706,6 +501,10 @@ def main():
     # Progress Bar
     progress_bar = ttk.Progressbar(buttons_frame, orient=tk.HORIZONTAL, mode='determinate')
 
+    # Status Label (per-worker utilisation of the last run)
+    status_label = ttk.Label(buttons_frame, text="", justify=tk.LEFT)
+    status_label.pack(side=tk.BOTTOM, fill=tk.X, padx=5, pady=5)
+
     # Bottom Frame for Treeview and Plot
     bottom_frame = ttk.Frame(root)
     bottom_frame.pack(side=tk.TOP, fill=tk.BOTH, expand=True, padx=10, pady=10)
@@ -746,6 +545,7 @@ def main():
         "MAX_RADIUS": float(entries_circle["MAX_RADIUS"].get()),
         "RADIUS_INCREMENT": float(entries_thresholds["RADIUS_INCREMENT"].get()),
         "CHECK_DIMENSIONS": check_dimensions_var.get(),
+        "CRITICAL_RADII": critical_radii_var.get(),
         "DIFFERENCE_THRESHOLD": float(entries_thresholds["DIFFERENCE_THRESHOLD"].get())
     }))
 
@@ -758,7 +558,14 @@ def main():
         canvas_frame,
         progress_bar,
         calculate_button,
-        odd_center_var
+        odd_center_var,
+        both_centers_var,
+        critical_radii_var,
+        resume_var,
+        workers_spin,
+        status_label,
+        pause_button,
+        cancel_button
     ))
 
     # No initial run
@@ -0,0 +1,509 @@
+import hashlib
+import math
+import struct
+from bisect import bisect_right
+from itertools import chain
+from wedges import is_edge_buildable, edge_width
+from telemetry import STAGES, HULL, SIMPLIFY, MAX_DIFF, CHECK_DIMENSIONS, METRICS
+
+# Rejection tests that run once the polygon's vertices are known, by telemetry stage. The default order is cheapest
+# first: max_diff only needs the vertices, check_dimensions needs every edge.
+FILTERS = (MAX_DIFF, CHECK_DIMENSIONS)
+
+def distance_to_center(center_x, center_y, grid_x, grid_y):
+    return math.sqrt((grid_x - center_x)**2 + (grid_y - center_y)**2)
+
+def cross(o, a, b):
+    return (a[0]-o[0])*(b[1]-o[1]) - (a[1]-o[1])*(b[0]-o[0])
+
+def convex_hull(points):
+    return monotone_chain(sorted(points))
+
+def monotone_chain(points):
+    """
+    Andrew's monotone chain on points that are already sorted by (x, y). Runs in linear time.
+    """
+    if len(points) <= 1:
+        return points
+
+    lower = []
+    for p in points:
+        while len(lower) >= 2 and cross(lower[-2], lower[-1], p) <= 0:
+            lower.pop()
+        lower.append(p)
+
+    upper = []
+    for p in reversed(points):
+        while len(upper) >= 2 and cross(upper[-2], upper[-1], p) <= 0:
+            upper.pop()
+        upper.append(p)
+
+    return lower[:-1] + upper[:-1]
+
+def inside_limit(center_x, center_y, radius):
+    """
+    Works in doubled coordinates (X = 2 * (x - center_x), Y = 2 * (y - center_y)), where every grid point
+    has integer coordinates for both the (0, 0) and (0.5, 0.5) centers. Returns the largest integer
+    m = X^2 + Y^2 whose point distance_to_center still reports as <= radius, so integer comparisons
+    against it select exactly the same points as the floating point test.
+    """
+    limit = int(4 * radius * radius)
+    while math.sqrt((limit + 1) / 4) <= radius:
+        limit += 1
+    while limit >= 0 and math.sqrt(limit / 4) > radius:
+        limit -= 1
+    return limit
+
+def boundary_columns(center_x, center_y, radius):
+    """
+    Returns the bottom and top inside grid point of every column, sorted by (x, y).
+    Only these can be hull vertices, so this replaces testing every point of the bounding square.
+    """
+    offset_x = round(2 * center_x)
+    offset_y = round(2 * center_y)
+    limit = inside_limit(center_x, center_y, radius)
+
+    points = []
+    for gx in range(int(math.floor(center_x - radius)), int(math.ceil(center_x + radius)) + 1):
+        X = 2 * gx - offset_x
+        remaining = limit - X * X
+        if remaining < 0:
+            continue
+        Y = math.isqrt(remaining)
+        if (Y - offset_y) % 2:
+            Y -= 1  # Y has to share the parity of the center offset to land on a grid point
+        if Y < 0:
+            continue
+        bottom = (offset_y - Y) // 2
+        top = (offset_y + Y) // 2
+        points.append((gx, bottom))
+        if top != bottom:
+            points.append((gx, top))
+    return points
+
+def column_hull(center_x, center_y, radius):
+    return monotone_chain(boundary_columns(center_x, center_y, radius))
+
+def is_collinear(a, b, c):
+    return cross(a, b, c) == 0
+
+def is_between(a, b, c):
+    return (min(a[0], c[0]) <= b[0] <= max(a[0], c[0])) and \
+           (min(a[1], c[1]) <= b[1] <= max(a[1], c[1]))
+
+def is_redundant(prev_p, curr_p, next_p):
+    """
+    Whether curr_p lies on the segment between its neighbours. For collinear points that is the case exactly
+    when the dot product of (curr - prev) and (next - curr) is not negative.
+    """
+    (ax, ay), (bx, by), (cx, cy) = prev_p, curr_p, next_p
+    return (bx - ax) * (cy - ay) == (by - ay) * (cx - ax) and (bx - ax) * (cx - bx) + (by - ay) * (cy - by) >= 0
+
+def remove_collinear_points(points):
+    """
+    Drops every vertex lying on the straight segment between its neighbours in a single pass over the ordered
+    polygon. Grid points are integers, so the cross product test is exact.
+    """
+    if len(points) < 3:
+        return points
+
+    stack = []
+    for p in points:
+        cx, cy = p
+        while len(stack) >= 2:
+            (ax, ay), (bx, by) = stack[-2], stack[-1]
+            if (bx - ax) * (cy - ay) != (by - ay) * (cx - ax) or (bx - ax) * (cx - bx) + (by - ay) * (cy - by) < 0:
+                break
+            stack.pop()
+        stack.append(p)
+
+    # The polygon is closed, so the points where it wraps around still need checking against each other
+    start = 0
+    while len(stack) - start >= 3:
+        if is_redundant(stack[-2], stack[-1], stack[start]):
+            stack.pop()
+        elif is_redundant(stack[-1], stack[start], stack[start + 1]):
+            start += 1
+        else:
+            break
+
+    return stack[start:]
+
+def sort_grid_points(center_x, center_y, grid_points):
+    def calculate_angle(point):
+        x, y = point
+        angle = math.atan2(y - center_y, x - center_x)
+        return angle if angle >= 0 else (2 * math.pi + angle)
+    return sorted(grid_points, key=calculate_angle)
+
+def check_dimensions(center_x, center_y, radius, grid_points):
+    sorted_points = sort_grid_points(center_x, center_y, grid_points)
+    num_points = len(sorted_points)
+
+    for i in range(num_points):
+        current_point = sorted_points[i]
+        next_point = sorted_points[(i + 1) % num_points]
+
+        delta_x = abs(next_point[0] - current_point[0])
+        delta_y = abs(next_point[1] - current_point[1])
+
+        if not is_edge_buildable(delta_x, delta_y):
+            return False
+
+    return True
+
+def check_polygon_edges(polygon):
+    """
+    check_dimensions for a polygon whose vertices are already in order around the center, so no angle sort is needed.
+    """
+    n = len(polygon)
+    for i in range(n):
+        A = polygon[i]
+        B = polygon[(i + 1) % n]
+        if not is_edge_buildable(abs(B[0] - A[0]), abs(B[1] - A[1])):
+            return False
+    return True
+
+def limit_radius(limit):
+    """
+    Radius of a doubled-coordinate squared distance (see inside_limit). Equal to distance_to_center for the same point.
+    """
+    return math.sqrt(limit) / 2
+
+def polygon_key(polygon):
+    """
+    Fixed-width key identifying a polygon whatever vertex it starts at: the first 8 bytes of a BLAKE2b hash of its
+    vertices rotated to start at the smallest one, as a signed 64-bit int so SQLite stores it as an INTEGER.
+    """
+    start = polygon.index(min(polygon))
+    rotated = polygon[start:] + polygon[:start]
+    packed = struct.pack(f"<{2 * len(rotated)}i", *chain.from_iterable(rotated))
+    return int.from_bytes(hashlib.blake2b(packed, digest_size=8).digest(), "little", signed=True)
+
+def parse_grid_points(grid_points):
+    """
+    Polygon tuple from the "(x,y),(x,y),..." text stored in the grid_points column.
+    """
+    return tuple(tuple(int(value) for value in point.split(",")) for point in grid_points[1:-1].split("),("))
+
+def shoelace_area(polygon):
+    n = len(polygon)
+    area = 0  # Exact for integer grid points
+    for i in range(n):
+        x0, y0 = polygon[i]
+        x1, y1 = polygon[(i + 1) % n]
+        area += (x0 * y1) - (x1 * y0)
+    return abs(area) / 2.0
+
+def polygon_perimeter(polygon):
+    perimeter = 0.0
+    n = len(polygon)
+    for i in range(n):
+        x0, y0 = polygon[i]
+        x1, y1 = polygon[(i + 1) % n]
+        perimeter += math.hypot(x1 - x0, y1 - y0)
+    return perimeter
+
+def lattice_limits(center_x, center_y, max_radius):
+    """
+    Returns the sorted, distinct doubled-coordinate squared distances X^2 + Y^2 (see inside_limit) of every grid point
+    within max_radius. These are the critical radii in exact integer form: the set of inside points (and so the
+    polygon) only changes when the tested radius reaches one of them.
+    """
+    offset_x = round(2 * center_x)
+    offset_y = round(2 * center_y)
+    limit = inside_limit(center_x, center_y, max_radius)
+
+    # X -> -X and Y -> -Y keep the parity, so one quadrant has every distinct distance
+    limits = set()
+    for X in range(offset_x, math.isqrt(limit) + 1, 2):
+        XX = X * X
+        limits.update(XX + Y * Y for Y in range(offset_y, math.isqrt(limit - XX) + 1, 2))
+    return sorted(limits)
+
+def lattice_limits_by_parity(max_radius):
+    """
+    lattice_limits for both centers in one pass over the grid, as {odd_center_val: limits}. Around (0, 0) the doubled
+    coordinates are both even and around (0.5, 0.5) both odd, so each X column feeds exactly one of the two tables.
+    """
+    parity_limit = (inside_limit(0.0, 0.0, max_radius), inside_limit(0.5, 0.5, max_radius))
+    limits = (set(), set())
+    for X in range(math.isqrt(max(parity_limit)) + 1):
+        parity = X & 1
+        room = parity_limit[parity] - X * X
+        if room >= 0:
+            limits[parity].update(X * X + Y * Y for Y in range(parity, math.isqrt(room) + 1, 2))
+    return {parity: sorted(parity_limits) for parity, parity_limits in enumerate(limits)}
+
+def lattice_distances(center_x, center_y, max_radius):
+    """
+    Returns the critical radii from lattice_limits as sorted distances.
+    """
+    return [limit_radius(limit) for limit in lattice_limits(center_x, center_y, max_radius)]
+
+def critical_radii(distances, initial_radius, max_radius):
+    """
+    Returns the radii an event-driven sweep has to test: initial_radius itself plus every critical
+    radius in (initial_radius, max_radius]. Any radius in between yields the same polygon as the
+    critical radius just below it.
+    """
+    start = bisect_right(distances, initial_radius)
+    end = bisect_right(distances, max_radius)
+    return [initial_radius] + distances[start:end]
+
+def next_critical_radius(distances, radius):
+    """
+    Returns the smallest critical radius strictly greater than radius, i.e. the exclusive upper
+    bound of the interval in which the polygon found at radius stays the same.
+    """
+    index = bisect_right(distances, radius)
+    if index < len(distances):
+        return distances[index]
+    return None
+
+def no_lap(stage):
+    pass
+
+def filter_order(names):
+    """
+    Engine filter order (stage ids) from stage names, e.g. ("max_diff", "check_dimensions"). Every filter has to
+    be listed exactly once; raises ValueError otherwise.
+    """
+    order = tuple(STAGES.index(name) if name in STAGES else -1 for name in names)
+    if sorted(order) != sorted(FILTERS):
+        raise ValueError(f"Filter order must list each of {', '.join(STAGES[stage] for stage in FILTERS)} once.")
+    return order
+
+def compute_for_radius(args, timer=None, columns=None):
+    """
+    args is (center_x, center_y, radius, check_dimensions_flag, difference_threshold, filters), filters being
+    FILTERS in the order to run them. timer, a telemetry.StageTimer, gets a lap at the end of every stage and a
+    reject from the stage that drops the radius. columns is only used by compute_for_radius_symmetric.
+    """
+    center_x, center_y, radius, check_dimensions_flag, difference_threshold, filters = args
+    lap = timer.lap if timer is not None else no_lap
+    reject = timer.reject if timer is not None else no_lap
+
+    # Only the top and bottom point of each column can be on the hull
+    hull = column_hull(center_x, center_y, radius)
+    if len(hull) < 3:
+        reject(HULL)
+        return None
+    lap(HULL)
+
+    simplified = remove_collinear_points(hull)
+    if len(simplified) < 3:
+        reject(SIMPLIFY)
+        return None
+    lap(SIMPLIFY)
+
+    for stage in filters:
+        if stage == MAX_DIFF:
+            # Compare squared distances in doubled coordinates and only take the square root of the extremes
+            offset_x = round(2 * center_x)
+            offset_y = round(2 * center_y)
+            squared_distances = [(2 * x - offset_x) ** 2 + (2 * y - offset_y) ** 2 for x, y in simplified]
+            # Compute Real Radius (max distance to center)
+            real_radius = limit_radius(max(squared_distances))
+            # Compute max difference from Real Radius (the vertex closest to the center)
+            max_diff = real_radius - limit_radius(min(squared_distances))
+
+            # Check difference threshold
+            if max_diff > difference_threshold:
+                reject(MAX_DIFF)
+                return None
+            lap(MAX_DIFF)
+        elif check_dimensions_flag:
+            # The hull is already ordered around the center
+            if not check_polygon_edges(simplified):
+                reject(CHECK_DIMENSIONS)
+                return None
+            lap(CHECK_DIMENSIONS)
+
+    # Compute Diameter: max_x - min_x
+    x_values = [p[0] for p in simplified]
+    diameter = max(x_values) - min(x_values)
+
+    # Compute Area and Perimeter for Circularity
+    area = shoelace_area(simplified)
+    perimeter = polygon_perimeter(simplified)
+    circularity = (4 * math.pi * area) / (perimeter ** 2) if perimeter > 0 else 0
+
+    # New Feature: Calculate max_width
+    widths = []
+    n = len(simplified)
+    for i in range(n):
+        A = simplified[i]
+        B = simplified[(i + 1) % n]
+        delta_x = abs(B[0] - A[0])
+        delta_y = abs(B[1] - A[1])
+        if delta_x == 0 and delta_y == 0:
+            continue  # Skip if both deltas are zero
+        widths.append(edge_width(delta_x, delta_y))
+    max_width = max(widths) if widths else 0
+
+    # Calculate Uniformity
+    side_lengths = []
+    for i in range(len(simplified)):
+        A = simplified[i]
+        B = simplified[(i + 1) % len(simplified)]
+        length = math.hypot(B[0] - A[0], B[1] - A[1])
+        side_lengths.append(length)
+
+    if not side_lengths:
+        return None
+
+    average_length = sum(side_lengths) / len(side_lengths)
+    max_length = max(side_lengths)
+    uniformity = average_length / max_length if max_length != 0 else 0
+
+    lap(METRICS)
+    return (radius, len(simplified), real_radius, max_diff, max_width, diameter, circularity, tuple(simplified), uniformity)
+
+def octant_columns(offset, limit):
+    """
+    Top point (U, V) of every column from the +y axis until the columns drop below the diagonal, for the points
+    within limit (see inside_limit). offset is 2 * center_x, i.e. 1 around an odd center.
+    """
+    columns = []
+    U = offset
+    while U * U <= limit:
+        V = math.isqrt(limit - U * U)
+        if (V - offset) % 2:
+            V -= 1
+        if V < U:
+            break
+        columns.append((U, V))
+        U += 2
+    return columns
+
+def octant_hull(center_x, center_y, radius, columns=None):
+    """
+    Returns the hull vertices between the +y axis and the diagonal x = y, clockwise from the top, in centered
+    doubled coordinates (see inside_limit). The polygon is symmetric under the 8 reflections of the square,
+    so these vertices determine it completely. columns, if given, are the octant_columns for this radius.
+    """
+    if columns is None:
+        columns = octant_columns(round(2 * center_x), inside_limit(center_x, center_y, radius))
+
+    chain = upper_chain(columns)
+
+    # The neighbouring octants' mirror images decide which vertices survive at both octant boundaries
+    left = [(-U, V) for U, V in reversed(chain) if U > 0]
+    right = [(V, U) for U, V in reversed(chain) if U != V]
+    return [(U, V) for U, V in upper_chain(left + chain + right) if 0 <= U <= V]
+
+def upper_chain(points):
+    """
+    Upper half of the monotone chain, for points sorted by x from left to right.
+    """
+    chain = []
+    for p in points:
+        while len(chain) >= 2 and cross(chain[-2], chain[-1], p) >= 0:
+            chain.pop()
+        chain.append(p)
+    return chain
+
+def mirror_octant(octant):
+    """
+    Expands the octant from octant_hull into the full ring of vertices, clockwise, in doubled coordinates.
+    """
+    quadrant = octant + [(V, U) for U, V in reversed(octant) if U != V and U != 0]
+    ring = []
+    for _ in range(4):
+        ring.extend(quadrant)
+        quadrant = [(V, -U) for U, V in quadrant]  # Rotate a quarter turn clockwise
+    return ring
+
+def octant_edges(octant):
+    """
+    Returns (start, end, multiplicity) for the edges that generate every edge of the full polygon: edges inside the
+    octant appear 8 times, the edges crossing the y axis and the diagonal 4 times each.
+    """
+    edges = [(octant[i], octant[i + 1], 8) for i in range(len(octant) - 1)]
+    first_U, first_V = octant[0]
+    if first_U > 0:
+        edges.append(((-first_U, first_V), octant[0], 4))
+    last_U, last_V = octant[-1]
+    if last_U != last_V:
+        edges.append((octant[-1], (last_V, last_U), 4))
+    return edges
+
+def symmetric_edges(octant):
+    """
+    octant_edges with each edge's deltas in grid units, as ((delta_x, delta_y), start, end, multiplicity). Both ends
+    share the center's parity, so the doubled deltas are even.
+    """
+    return [((abs(B[0] - A[0]) // 2, abs(B[1] - A[1]) // 2), A, B, multiplicity) for A, B, multiplicity in octant_edges(octant)]
+
+def compute_for_radius_symmetric(args, timer=None, columns=None):
+    """
+    Same result as compute_for_radius, but only builds one octant of the hull and derives the full polygon and
+    its metrics by mirroring. Falls back to compute_for_radius for centers without 8-fold symmetry. columns, the
+    radius' octant_columns, saves scanning the columns when the caller keeps them up to date (see lattice.py).
+    """
+    center_x, center_y, radius, check_dimensions_flag, difference_threshold, filters = args
+    if center_x != center_y or (2 * center_x) % 1 != 0:
+        return compute_for_radius(args, timer)
+    offset = round(2 * center_x)
+    lap = timer.lap if timer is not None else no_lap
+    reject = timer.reject if timer is not None else no_lap
+
+    # The octant's vertices are already free of collinear points, so the filters can run before it is mirrored
+    octant = octant_hull(center_x, center_y, radius, columns)
+    if not octant or octant[0] == (0, 0):
+        reject(HULL)
+        return None  # No grid point, or only the center itself, is inside the circle
+    lap(HULL)
+
+    edges = None
+    for stage in filters:
+        if stage == MAX_DIFF:
+            # Every mirror image of a vertex is the same distance from the center, and only the extremes need a square root
+            squared_distances = [U * U + V * V for U, V in octant]
+            real_radius = limit_radius(max(squared_distances))
+            max_diff = real_radius - limit_radius(min(squared_distances))
+
+            # Check difference threshold
+            if max_diff > difference_threshold:
+                reject(MAX_DIFF)
+                return None
+            lap(MAX_DIFF)
+        elif check_dimensions_flag:
+            edges = symmetric_edges(octant)
+            lap(SIMPLIFY)
+            if not all(is_edge_buildable(delta_x, delta_y) for (delta_x, delta_y), _, _, _ in edges):
+                reject(CHECK_DIMENSIONS)
+                return None
+            lap(CHECK_DIMENSIONS)
+
+    if edges is None:
+        edges = symmetric_edges(octant)
+    ring = mirror_octant(octant)
+    if len(ring) < 3:
+        reject(SIMPLIFY)
+        return None
+    lap(SIMPLIFY)
+
+    # The widest column is the top of the octant, mirrored onto both sides of the y axis
+    diameter = octant[0][1]
+
+    # Shoelace terms and lengths are the same for every mirror image of an edge (doubled coordinates scale area by 4)
+    area = abs(sum(multiplicity * (A[0] * B[1] - B[0] * A[1]) for _, A, B, multiplicity in edges)) / 8.0
+    side_lengths = [(math.hypot(delta_x, delta_y), multiplicity) for (delta_x, delta_y), _, _, multiplicity in edges]
+    perimeter = sum(length * multiplicity for length, multiplicity in side_lengths)
+    circularity = (4 * math.pi * area) / (perimeter ** 2) if perimeter > 0 else 0
+
+    max_width = max(edge_width(delta_x, delta_y) for (delta_x, delta_y), _, _, _ in edges)
+
+    average_length = perimeter / len(ring)
+    max_length = max(length for length, _ in side_lengths)
+    uniformity = average_length / max_length if max_length != 0 else 0
+
+    # Same vertex order as compute_for_radius: counter-clockwise from the lowest, leftmost point
+    polygon = [((U + offset) // 2, (V + offset) // 2) for U, V in reversed(ring)]
+    start = polygon.index(min(polygon))
+    polygon = polygon[start:] + polygon[:start]
+
+    lap(METRICS)
+    return (radius, len(polygon), real_radius, max_diff, max_width, diameter, circularity, tuple(polygon), uniformity)
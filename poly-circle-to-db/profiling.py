@@ -0,0 +1,136 @@
+import cProfile
+import glob
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+# Opt-in profiling of the sweep's worker processes. Set POLY_PROFILE to a directory (generate.py --profile does) and
+# every process that computes ranges keeps a cProfile profile and a stack sampler running while it works. Each
+# process rewrites its own files after every range:
+#   worker-<pid>.prof        cProfile stats
+#   worker-<pid>.collapsed   sampled stacks, "outer;...;inner count" per line
+# At the end of the sweep the parent merges them into profile.pstats and profile.collapsed, which flamegraph.pl,
+# speedscope and similar tools read directly.
+
+PROFILE_ENV = "POLY_PROFILE"
+SAMPLE_INTERVAL = 0.001  # Seconds between stack samples; waiting for the GIL makes the real interval longer
+
+def profile_directory():
+    return os.environ.get(PROFILE_ENV) or None
+
+class StackSampler:
+    """
+    Counts the stacks of one thread, sampled from a background thread while active.
+    """
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        self.interval = interval
+        self.counts = Counter()
+        self.thread_id = None
+        self._active = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def start(self):
+        self.thread_id = threading.get_ident()
+        self._active.set()
+
+    def stop(self):
+        self._active.clear()
+
+    def _run(self):
+        while True:
+            self._active.wait()
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            if stack:
+                self.counts[";".join(reversed(stack))] += 1
+            time.sleep(self.interval)
+
+class WorkerProfiler:
+    """
+    cProfile plus a StackSampler for the calling process, active inside a with block and saved at its end.
+    """
+    def __init__(self, directory):
+        self.directory = directory
+        self.profile = cProfile.Profile()
+        self.sampler = StackSampler()
+        self.stats_path = os.path.join(directory, f"worker-{os.getpid()}.prof")
+        self.collapsed_path = os.path.join(directory, f"worker-{os.getpid()}.collapsed")
+
+    def __enter__(self):
+        self.sampler.start()
+        self.profile.enable()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.profile.disable()
+        self.sampler.stop()
+        self.profile.dump_stats(self.stats_path)
+        write_collapsed(self.collapsed_path, self.sampler.counts)
+
+# This process' profiler, created on its first profiled range
+_profiler = None
+
+@contextmanager
+def profile_worker():
+    """
+    Profiles the block when POLY_PROFILE is set, otherwise does nothing.
+    """
+    global _profiler
+    directory = profile_directory()
+    if directory is None:
+        yield
+        return
+    if _profiler is None or _profiler.directory != directory:
+        _profiler = WorkerProfiler(directory)
+    with _profiler:
+        yield
+
+def start_profiling(directory):
+    """
+    Called by the parent before a sweep: clears the previous sweep's worker files and this process' profiler.
+    """
+    global _profiler
+    os.makedirs(directory, exist_ok=True)
+    for path in glob.glob(os.path.join(directory, "worker-*")):
+        os.remove(path)
+    _profiler = None
+
+def write_collapsed(path, counts):
+    with open(path, "w") as f:
+        for stack, count in sorted(counts.items()):
+            f.write(f"{stack} {count}\n")
+
+def read_collapsed(path):
+    counts = Counter()
+    with open(path) as f:
+        for line in f:
+            stack, _, count = line.rstrip("\n").rpartition(" ")
+            counts[stack] += int(count)
+    return counts
+
+def merge_profiles(directory):
+    """
+    Merges the worker files into profile.pstats and profile.collapsed. Returns their paths, or None when no worker
+    wrote anything.
+    """
+    stats_paths = sorted(glob.glob(os.path.join(directory, "worker-*.prof")))
+    if not stats_paths:
+        return None
+    stats_path = os.path.join(directory, "profile.pstats")
+    pstats.Stats(*stats_paths).dump_stats(stats_path)
+
+    counts = Counter()
+    for path in glob.glob(os.path.join(directory, "worker-*.collapsed")):
+        counts.update(read_collapsed(path))
+    collapsed_path = os.path.join(directory, "profile.collapsed")
+    write_collapsed(collapsed_path, counts)
+    return stats_path, collapsed_path
@@ -0,0 +1,421 @@
+import os
+import signal
+import time
+from bisect import bisect_right
+from multiprocessing import Event, Pool, cpu_count
+from poly import filter_order, inside_limit, lattice_distances, lattice_limits_by_parity, limit_radius, critical_radii, next_critical_radius
+from database import DATABASE_PATH, ResultWriter, encode_polygon, load_coverage
+from telemetry import STAGES, StageTimer
+from lattice import LatticeTable, ColumnTops
+from profiling import profile_directory, profile_worker, start_profiling, merge_profiles
+from memory import MemoryRecorder, memory_enabled, start_memory_run, radius_band, merge_records
+from constants import MIN_RADIUS_LIMIT, RADIUS_LIMIT
+
+# Per-radius cost model for the symmetric engine: linear in the radius plus a fixed per-call overhead
+# (in radius units, measured at about 40 on the r=25..400 range).
+RADIUS_COST_OVERHEAD = 40
+# Batches handed out per worker. More batches balance better at the end of a run, fewer cost less IPC.
+BATCHES_PER_WORKER = 8
+# Most estimated cost in one batch, so a worker never holds more than a few hundred large radii's polygons (each
+# about 350 vertices at radius 1000) before handing them back. Only large radius sweeps reach it.
+MAX_BATCH_COST = 500_000
+
+def estimate_cost(radius):
+    return RADIUS_COST_OVERHEAD + radius
+
+def make_batches(radii, workers, batches_per_worker=BATCHES_PER_WORKER, max_batch_cost=MAX_BATCH_COST):
+    """
+    Splits the radii into contiguous ranges with roughly equal estimated cost, at most max_batch_cost each, returned
+    most expensive first so the big radii don't end up as stragglers on a single core.
+    """
+    if not radii:
+        return []
+    radii = sorted(radii)
+    total_cost = sum(estimate_cost(radius) for radius in radii)
+    target_cost = min(total_cost / (workers * batches_per_worker), max_batch_cost)
+
+    batches = []
+    current = []
+    current_cost = 0
+    for radius in radii:
+        current.append(radius)
+        current_cost += estimate_cost(radius)
+        if current_cost >= target_cost:
+            batches.append((current_cost, current))
+            current = []
+            current_cost = 0
+    if current:
+        batches.append((current_cost, current))
+
+    batches.sort(key=lambda batch: batch[0], reverse=True)
+    return [batch for _, batch in batches]
+
+class SweepControl:
+    """
+    Cancel and pause token shared with the worker processes, which check it between radii. A cancelled sweep stops
+    at the next radius and still returns (and saves) everything computed so far.
+    """
+    def __init__(self):
+        self.cancel_event = Event()
+        self.run_event = Event()  # Cleared while paused
+        self.run_event.set()
+
+    def cancel(self):
+        self.cancel_event.set()
+        self.run_event.set()  # Let paused workers see the cancel
+
+    def pause(self):
+        self.run_event.clear()
+
+    def resume(self):
+        self.run_event.set()
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    @property
+    def paused(self):
+        return not self.run_event.is_set()
+
+# The sweep's SweepControl events and lattice tables by center, in the worker processes (see init_worker) or in
+# this process for 1 worker
+_cancel_event = None
+_run_event = None
+_lattice_tables = {}
+
+def init_worker(cancel_event, run_event, lattice_specs):
+    global _cancel_event, _run_event, _lattice_tables
+    _cancel_event = cancel_event
+    _run_event = run_event
+    _lattice_tables = {center: LatticeTable.attach(spec) for center, spec in lattice_specs.items()}
+    # Ctrl+C is the parent's to handle (it cancels the sweep cleanly), workers shouldn't die from it
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+def compute_range(args):
+    """
+    Worker entry point: sweep_range, profiled when POLY_PROFILE is set (see profiling.py).
+    """
+    with profile_worker():
+        return sweep_range(args)
+
+def sweep_range(args):
+    """
+    Runs the engine over one contiguous, ascending range of radii and only returns a result when
+    the polygon differs from the one at the previous radius, so each result carries the first radius of the range
+    it appeared at. Also reports which process did the work, how long it was busy and the time spent and radii
+    rejected in each stage.
+    When the sweep is cancelled it stops early and reports the radii it got through; radius_range is None if none.
+    sweep_index tells run_sweeps which of its sweeps the range belongs to. With a lattice table for the center, the
+    octant's columns are carried from one radius to the next instead of being scanned for each. When POLY_MEMORY
+    is set it also returns a memory record per radius band (see memory.py), otherwise None. With an odd_center value
+    it also returns each transition's encode_polygon, the database columns the parent's writer would otherwise
+    have to work out on its own, otherwise None.
+    """
+    sweep_index, engine, settings, radii, odd_center_val = args
+    center_x, center_y, check_dimensions_flag, difference_threshold, filters = settings
+    start = time.perf_counter()
+    paused = 0.0
+    timer = StageTimer()
+    table = _lattice_tables.get((center_x, center_y))
+    tops = None
+    recorder = MemoryRecorder() if memory_enabled() else None
+    band = None
+
+    transitions = []
+    previous_limit = None
+    previous_polygon = None
+    done = 0
+    for radius in radii:
+        if _cancel_event is not None:
+            if not _run_event.is_set():
+                pause_start = time.perf_counter()
+                _run_event.wait()
+                paused += time.perf_counter() - pause_start
+            if _cancel_event.is_set():
+                break
+        done += 1
+        if recorder is not None and radius_band(radius) != band:
+            if band is not None:
+                recorder.record(band)
+            band = radius_band(radius)
+
+        # Same inside points as the previous radius means the same polygon, so there is nothing to compute
+        limit = inside_limit(center_x, center_y, radius)
+        if limit == previous_limit:
+            continue
+        previous_limit = limit
+
+        timer.start()
+        columns = None
+        if table is not None and limit <= table.max_limit:
+            if tops is None:
+                tops = ColumnTops(table, limit)
+            columns = tops.advance(limit)
+        res = engine((center_x, center_y, radius, check_dimensions_flag, difference_threshold, filters), timer, columns)
+        if res is not None and res[7] != previous_polygon:
+            transitions.append(res)
+            previous_polygon = res[7]
+
+    radius_range = (radii[0], radii[done - 1]) if done else None
+    memory = None
+    if recorder is not None:
+        if band is not None:
+            recorder.record(band)
+        recorder.stop()
+        memory = recorder.bands
+    encoded = [encode_polygon(res[7], odd_center_val) for res in transitions] if odd_center_val is not None else None
+    return (sweep_index, os.getpid(), time.perf_counter() - start - paused, done, radius_range, timer.totals, timer.rejects, memory,
+            transitions, encoded)
+
+def run_sweep(engine, settings, radii, workers, progress=None, on_results=None, control=None):
+    """
+    Runs engine over every radius on a pool of workers processes (in this process when workers is 1).
+    settings is (center_x, center_y, check_dimensions_flag, difference_threshold, filters), filters being
+    poly.FILTERS in the order the engine runs them (see poly.filter_order).
+    progress, a telemetry.ProgressChannel, is fed after every range and finished at the end.
+    control, a SweepControl, lets another thread pause or cancel the sweep.
+    Returns the polygon transitions (a polygon can still repeat where two ranges meet) and the per-worker
+    statistics for format_utilisation. When on_results is given, each range's transitions and its (first, last)
+    radius are passed to it as soon as they arrive instead of being collected, and the returned list is empty.
+    The range is None when a cancel came before its first radius.
+    """
+    forward = (lambda _, batch_results, radius_range, __: on_results(batch_results, radius_range)) if on_results is not None else None
+    results, stats = run_sweeps(engine, [(settings, radii)], workers, progress, forward, control)
+    return results[0], stats
+
+def run_sweeps(engine, sweeps, workers, progress=None, on_results=None, control=None, parities=None):
+    """
+    run_sweep for several (settings, radii) sweeps at once, e.g. both center parities: their ranges share one
+    pool and are handed out together, most expensive first, so neither sweep waits for the other to finish.
+    Returns one transitions list per sweep, and on_results gets the sweep's index before the transitions.
+    parities, one odd_center value per sweep, has the workers encode the transitions for the database too (see
+    sweep_range); on_results gets the encoded list after the range, None without parities.
+    Sweeps centered on the grid's diagonal share a lattice table (see lattice.py) with the workers for the run.
+    When profiling, stats["profile"] has the paths of the merged reports. With POLY_MEMORY set, stats["memory"]
+    has the parent's and each worker's memory records by radius band.
+    """
+    global _cancel_event, _run_event, _lattice_tables
+    jobs = [(sweep_index, engine, settings, batch, parities[sweep_index] if parities is not None else None)
+            for sweep_index, (settings, radii) in enumerate(sweeps)
+            for batch in make_batches(radii, workers)]
+    jobs.sort(key=lambda job: sum(estimate_cost(radius) for radius in job[3]), reverse=True)
+
+    results = [[] for _ in sweeps]
+    worker_stats = {}
+    stage_times = [0.0] * len(STAGES)
+    stage_rejects = [0] * len(STAGES)
+    start = time.perf_counter()
+
+    def collect(done):
+        sweep_index, pid, busy, radii_done, radius_range, batch_stage_times, batch_stage_rejects, batch_memory, batch_results, encoded = done
+        if on_results is not None:
+            on_results(sweep_index, batch_results, radius_range, encoded)
+        else:
+            results[sweep_index].extend(batch_results)
+        stats = worker_stats.setdefault(pid, {"busy": 0.0, "batches": 0, "radii": 0})
+        stats["busy"] += busy
+        stats["batches"] += 1
+        stats["radii"] += radii_done
+        for stage, seconds in enumerate(batch_stage_times):
+            stage_times[stage] += seconds
+        for stage, rejects in enumerate(batch_stage_rejects):
+            stage_rejects[stage] += rejects
+        if progress is not None:
+            progress.update(radii_done, len(batch_results), batch_stage_times, batch_stage_rejects)
+        if memory is not None:
+            if batch_memory:
+                merge_records(memory["workers"].setdefault(pid, {}), batch_memory)
+            if radius_range is not None:
+                parent_memory.record(radius_band(radius_range[1]))
+
+    max_radii = {}
+    for (center_x, center_y, *_), radii in sweeps:
+        if radii and center_x == center_y and (2 * center_x) % 1 == 0:
+            max_radii[center_x, center_y] = max(max_radii.get((center_x, center_y), 0), max(radii))
+    directory = profile_directory()
+    if directory is not None:
+        start_profiling(directory)
+    memory = None
+    if memory_enabled():
+        start_memory_run()
+        memory = {"parent": {}, "workers": {}}
+        parent_memory = MemoryRecorder()
+
+    tables = {}
+    try:
+        for center, max_radius in max_radii.items():
+            tables[center] = LatticeTable.create(center[0], max_radius)
+
+        events = (control.cancel_event, control.run_event) if control is not None else (None, None)
+        if workers == 1:
+            _cancel_event, _run_event = events
+            _lattice_tables = tables
+            try:
+                for job in jobs:
+                    collect(compute_range(job))
+            finally:
+                _cancel_event, _run_event = None, None
+                _lattice_tables = {}
+        else:
+            specs = {center: table.spec for center, table in tables.items()}
+            with Pool(processes=workers, initializer=init_worker, initargs=events + (specs,)) as pool:
+                for done in pool.imap_unordered(compute_range, jobs):
+                    collect(done)
+    finally:
+        for table in tables.values():
+            table.close()
+    if progress is not None:
+        progress.finish()
+
+    stats = {"wall_time": time.perf_counter() - start, "workers": worker_stats, "stage_times": dict(zip(STAGES, stage_times)),
+             "stage_rejects": dict(zip(STAGES, stage_rejects)),
+             "cancelled": control is not None and control.cancelled}
+    if directory is not None:
+        stats["profile"] = merge_profiles(directory)
+    if memory is not None:
+        parent_memory.stop()
+        memory["parent"] = parent_memory.bands
+        stats["memory"] = memory
+    return results, stats
+
+def format_utilisation(stats):
+    """
+    One line per worker: batches and radii computed, busy time and busy share of the sweep's wall time.
+    """
+    wall_time = stats["wall_time"]
+    lines = []
+    for index, (pid, worker) in enumerate(sorted(stats["workers"].items()), start=1):
+        share = worker["busy"] / wall_time * 100 if wall_time > 0 else 0
+        lines.append(f"Worker {index} (pid {pid}): {worker['batches']} batches, {worker['radii']} radii, "
+                     f"busy {worker['busy']:.2f}s of {wall_time:.2f}s ({share:.0f}%)")
+    return "\n".join(lines)
+
+def check_config(initial_radius, max_radius, radius_increment, difference_threshold, workers):
+    """
+    Raises ValueError with a user-facing message when a sweep setting is out of range.
+    """
+    if not (MIN_RADIUS_LIMIT <= initial_radius <= RADIUS_LIMIT - 1):
+        raise ValueError(f"Initial Radius must be between {MIN_RADIUS_LIMIT} and {RADIUS_LIMIT - 1}.")
+    if not (MIN_RADIUS_LIMIT + 1 <= max_radius <= RADIUS_LIMIT):
+        raise ValueError(f"Max Radius must be between {MIN_RADIUS_LIMIT + 1} and {RADIUS_LIMIT}.")
+    if initial_radius > max_radius:
+        raise ValueError("Initial Radius cannot be greater than Max Radius.")
+    if difference_threshold < 0:
+        raise ValueError("Difference Threshold cannot be negative.")
+    if radius_increment <= 0:
+        raise ValueError("Radius Increment must be positive.")
+    if not (1 <= workers <= cpu_count()):
+        raise ValueError(f"Workers must be between 1 and {cpu_count()}.")
+
+def plan_sweep(config, distances=None):
+    """
+    Radii to test for config, plus every distance from the center to a grid point (a little past MAX_RADIUS so the
+    last polygon's interval is closed), which add_intervals needs. Pass distances if they are already known.
+    """
+    initial_radius = config["INITIAL_RADIUS"]
+    max_radius = config["MAX_RADIUS"]
+    if distances is None:
+        distances = lattice_distances(config["CENTER_X"], config["CENTER_Y"], max_radius + 2)
+
+    if config["CRITICAL_RADII"]:
+        # Event-driven sweep: the polygon only changes when a new grid point enters the circle
+        radii = critical_radii(distances, initial_radius, max_radius)
+    else:
+        radii = []
+        r = initial_radius
+        while r <= max_radius:
+            radii.append(r)
+            r += config["RADIUS_INCREMENT"]
+    return radii, distances
+
+def parity_configs(config):
+    """
+    One config per center parity the sweep covers: both when BOTH_CENTERS is set, otherwise just config.
+    """
+    if not config.get("BOTH_CENTERS"):
+        return [config]
+    return [dict(config, ODD_CENTER=odd_center, CENTER_X=center, CENTER_Y=center)
+            for odd_center, center in ((False, 0.0), (True, 0.5))]
+
+def plan_sweeps(config, database_path=DATABASE_PATH):
+    """
+    plan_sweep for each of parity_configs(config), as the (config, radii, distances) list sweep_to_database takes.
+    With RESUME, radii the database already covers are left out. Also returns how many radii there were before that.
+    """
+    configs = parity_configs(config)
+    # Both parities come out of a single pass over the grid
+    shared_limits = lattice_limits_by_parity(config["MAX_RADIUS"] + 2) if len(configs) > 1 else None
+
+    plans = []
+    planned = 0
+    for parity_config in configs:
+        odd_center_val = 1 if parity_config["ODD_CENTER"] else 0
+        distances = [limit_radius(limit) for limit in shared_limits[odd_center_val]] if shared_limits else None
+        radii, distances = plan_sweep(parity_config, distances)
+        planned += len(radii)
+        if config["RESUME"]:
+            radii = skip_covered(radii, load_coverage(odd_center_val, config["CHECK_DIMENSIONS"],
+                                                      config["DIFFERENCE_THRESHOLD"], database_path))
+        plans.append((parity_config, radii, distances))
+    return plans, planned
+
+def batch_coverage(radius_range, distances):
+    """
+    Radius interval [start, end) a finished range of critical radii covers: its polygons hold up to the next
+    critical radius after its last one, so neighbouring ranges join up.
+    """
+    first, last = radius_range
+    end = next_critical_radius(distances, last)
+    return first, end if end is not None else last
+
+def skip_covered(radii, coverage):
+    """
+    Drops the radii that fall in an already covered interval (sorted and merged, see database.load_coverage).
+    """
+    if not coverage:
+        return radii
+    starts = [start for start, _ in coverage]
+    remaining = []
+    for radius in radii:
+        index = bisect_right(starts, radius) - 1
+        if index < 0 or radius >= coverage[index][1]:
+            remaining.append(radius)
+    return remaining
+
+def add_intervals(results, distances):
+    """
+    Appends max_tested_radius to each result: the polygon stays the same from tested_radius up to (but excluding)
+    the next critical radius.
+    """
+    return [res + (next_critical_radius(distances, res[0]),) for res in results]
+
+def sweep_to_database(engine, plans, database_path=DATABASE_PATH, progress=None, on_results=None, control=None):
+    """
+    Runs the sweeps planned by plan_sweeps, all on one pool, and streams every range into the database through a
+    single writer as it finishes. Critical radii sweeps also record the ranges as covered, so a later run can skip
+    them (fixed steps can miss polygons, so they don't). A cancelled sweep saves the part of each range it got
+    through and records just that part as covered. on_results, if given, also receives each range's transitions,
+    after the odd_center value they belong to. The workers encode the rows (see database.encode_polygon), so the
+    writer only has to insert them. Returns the sweep statistics and the writer.
+    """
+    config = plans[0][0]
+    filters = filter_order(config["FILTER_ORDER"])
+    sweeps = [((parity_config["CENTER_X"], parity_config["CENTER_Y"], config["CHECK_DIMENSIONS"], config["DIFFERENCE_THRESHOLD"], filters), radii)
+              for parity_config, radii, _ in plans]
+    coverage_key = (config["CHECK_DIMENSIONS"], config["DIFFERENCE_THRESHOLD"]) if config["CRITICAL_RADII"] else None
+
+    parities = [1 if parity_config["ODD_CENTER"] else 0 for parity_config, _, _ in plans]
+
+    def save(sweep_index, transitions, radius_range, encoded):
+        distances = plans[sweep_index][2]
+        odd_center_val = parities[sweep_index]
+        if on_results is not None:
+            on_results(odd_center_val, transitions)
+        covered = batch_coverage(radius_range, distances) if radius_range is not None else None
+        writer.write(odd_center_val, add_intervals(transitions, distances), covered, encoded)
+
+    with ResultWriter(database_path, coverage_key) as writer:
+        _, stats = run_sweeps(engine, sweeps, config["WORKERS"], progress=progress, on_results=save, control=control,
+                              parities=parities)
+    return stats, writer
@@ -0,0 +1,116 @@
+import time
+
+# Stages of the per-radius engines. max_diff and check_dimensions are filters that run in a configurable order
+# (see poly.FILTERS); any stage but metrics can reject the radius.
+STAGES = ("hull", "simplify", "max_diff", "check_dimensions", "metrics")
+HULL, SIMPLIFY, MAX_DIFF, CHECK_DIMENSIONS, METRICS = range(len(STAGES))
+
+# Subscribers get at most one update per PROGRESS_INTERVAL seconds, plus the final one
+PROGRESS_INTERVAL = 0.25
+
+class StageTimer:
+    """
+    Cumulative seconds and rejected radii per stage. start() before each radius, then lap(stage) at the end of every
+    stage charges it the time since the previous lap. A stage that rejects the radius calls reject(stage) instead.
+    """
+    def __init__(self):
+        self.totals = [0.0] * len(STAGES)
+        self.rejects = [0] * len(STAGES)
+        self._last = time.perf_counter()
+
+    def start(self):
+        self._last = time.perf_counter()
+
+    def lap(self, stage):
+        now = time.perf_counter()
+        self.totals[stage] += now - self._last
+        self._last = now
+
+    def reject(self, stage):
+        self.lap(stage)
+        self.rejects[stage] += 1
+
+class ProgressChannel:
+    """
+    Collects what the workers report after each range (radii done, polygons found, stage times and rejects) and passes a
+    snapshot to every subscriber, throttled to one update per interval so a fast sweep can't flood a UI.
+    """
+    def __init__(self, total_radii, interval=PROGRESS_INTERVAL):
+        self.total_radii = total_radii
+        self.interval = interval
+        self.radii_done = 0
+        self.polygons = 0
+        self.stage_times = [0.0] * len(STAGES)
+        self.stage_rejects = [0] * len(STAGES)
+        self.start_time = time.perf_counter()
+        self._subscribers = []
+        self._last_publish = None
+
+    def subscribe(self, callback):
+        """
+        callback(snapshot) is called from the thread running the sweep.
+        """
+        self._subscribers.append(callback)
+
+    def update(self, radii_done, polygons, stage_times, stage_rejects):
+        self.radii_done += radii_done
+        self.polygons += polygons
+        for stage, seconds in enumerate(stage_times):
+            self.stage_times[stage] += seconds
+        for stage, rejects in enumerate(stage_rejects):
+            self.stage_rejects[stage] += rejects
+        now = time.perf_counter()
+        if self._last_publish is None or now - self._last_publish >= self.interval:
+            self._last_publish = now
+            self.publish()
+
+    def finish(self):
+        self.publish()
+
+    def publish(self):
+        snapshot = self.snapshot()
+        for callback in self._subscribers:
+            callback(snapshot)
+
+    def snapshot(self):
+        elapsed = time.perf_counter() - self.start_time
+        rate = self.radii_done / elapsed if elapsed > 0 else 0
+        remaining = self.total_radii - self.radii_done
+        return {
+            "radii_done": self.radii_done,
+            "total_radii": self.total_radii,
+            "polygons": self.polygons,
+            "elapsed": elapsed,
+            "radii_per_second": rate,
+            "eta": remaining / rate if rate > 0 else None,
+            "stage_times": dict(zip(STAGES, self.stage_times)),
+            "stage_rejects": dict(zip(STAGES, self.stage_rejects))
+        }
+
+def format_duration(seconds):
+    if seconds is None:
+        return "--:--:--"
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}"
+
+def format_progress(snapshot):
+    total = snapshot["total_radii"]
+    percent = snapshot["radii_done"] / total * 100 if total else 100
+    return (f"{snapshot['radii_done']}/{total} radii ({percent:.1f}%), {snapshot['radii_per_second']:.0f} radii/s, "
+            f"{snapshot['polygons']} polygons, ETA {format_duration(snapshot['eta'])}")
+
+def format_stage_times(snapshot):
+    """
+    Cumulative worker time per stage, summed over all workers, with each stage's share and the radii it rejected.
+    """
+    stage_times = snapshot["stage_times"]
+    stage_rejects = snapshot["stage_rejects"]
+    total = sum(stage_times.values())
+    parts = []
+    for stage, seconds in stage_times.items():
+        part = f"{stage} {seconds:.2f}s ({seconds / total * 100 if total > 0 else 0:.0f}%"
+        if stage_rejects[stage]:
+            part += f", {stage_rejects[stage]} rejected"
+        parts.append(part + ")")
+    return ", ".join(parts)
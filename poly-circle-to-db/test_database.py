@@ -0,0 +1,24 @@
+import sqlite3
+import pytest
+from constants import DEFAULT_CONFIG
+from database import ResultWriter, WRITER_QUEUE_SIZE
+from poly import compute_for_radius_symmetric
+from sweep import plan_sweeps, sweep_to_database
+
+def test_writer_reports_a_database_it_cannot_open(tmp_path):
+    path = str(tmp_path / "missing" / "results.db")
+    result = (5.0, 4, 5.0, 0.0, 1, 10, 0.9, ((0, 0), (1, 0), (1, 1), (0, 1)), 0.9, 6.0)
+    writer = ResultWriter(path)
+    # More writes than the queue holds: they must fail, not block on a queue nobody reads
+    with pytest.raises(sqlite3.OperationalError):
+        for _ in range(4 * WRITER_QUEUE_SIZE):
+            writer.write(0, [result])
+    with pytest.raises(sqlite3.OperationalError):
+        writer.close()
+
+def test_sweep_fails_when_the_database_cannot_be_opened(tmp_path):
+    path = str(tmp_path / "missing" / "results.db")
+    config = dict(DEFAULT_CONFIG, CENTER_X=0.0, CENTER_Y=0.0, INITIAL_RADIUS=5, MAX_RADIUS=40, WORKERS=1)
+    plans, _ = plan_sweeps(config, path)
+    with pytest.raises(sqlite3.OperationalError):
+        sweep_to_database(compute_for_radius_symmetric, plans, path)
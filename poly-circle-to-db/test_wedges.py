@@ -0,0 +1,21 @@
+from math import gcd
+from wedges import MAX_EDGE_SIZE, MAX_WEDGE_SIZE, compute_split_divisor, split_divisor
+
+def old_split_divisor(width, height):
+    # deteriorate_large_wedges' choice before the tables: the smallest common divisor that fits, else the gcd
+    for d in range(1, min(width, height) + 1):
+        if width % d == 0 and height % d == 0 and width // d <= MAX_WEDGE_SIZE and height // d <= MAX_WEDGE_SIZE:
+            return d
+    return gcd(width, height)
+
+def test_split_divisor_matches_the_old_choice():
+    for width in range(MAX_EDGE_SIZE + 1):
+        for height in range(MAX_EDGE_SIZE + 1):
+            if width > MAX_WEDGE_SIZE or height > MAX_WEDGE_SIZE:
+                assert split_divisor(width, height) == old_split_divisor(width, height), (width, height)
+
+def test_axis_aligned_edges_split_by_their_length():
+    for length in (9, 12, 17, 64, MAX_EDGE_SIZE, MAX_EDGE_SIZE + 7):
+        assert split_divisor(length, 0) == length
+        assert split_divisor(0, length) == length
+        assert compute_split_divisor(0, length) == length
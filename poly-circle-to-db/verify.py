@@ -0,0 +1,302 @@
+import argparse
+import hashlib
+import math
+import sqlite3
+import sys
+from math import gcd
+from poly import compute_for_radius, compute_for_radius_symmetric, FILTERS, lattice_distances, critical_radii, polygon_key
+from sweep import run_sweeps
+from vertices import decode_vertices
+from constants import DEFAULT_CONFIG
+
+# Differential check of the generator engines: runs two engines over the same radii for both centers and reports
+# where their results differ. The default reference is the original brute force engine below, which shares no
+# code with the optimised ones, so a speedup can be checked against it before it is adopted. Also prints content
+# checksums of results databases, so two generated files can be compared whatever their row order or page layout.
+# With --sweep the engine runs the way generate.py runs it, through sweep.run_sweeps with its lattice tables, batches
+# and workers, and every polygon the sweep finds is checked against the reference at the radius it first appears.
+
+# Floats are compared within a tolerance (the engines are allowed to round differently), everything else exactly
+FLOAT_FIELDS = ((2, "real_radius"), (3, "max_diff"), (6, "circularity"), (8, "uniformity"))
+INT_FIELDS = ((1, "sides"), (4, "max_width"), (5, "diameter"))
+DEFAULT_TOLERANCE = 1e-9
+# Decimals kept of every float in the checksum, so last-bit differences between engines don't change it
+CHECKSUM_DECIMALS = 9
+
+def reference_engine(args, timer=None, columns=None):
+    """
+    The generator's original compute_for_radius: tests every grid point of the bounding square, takes the convex
+    hull of all of them, removes collinear points in repeated passes and checks the edges in angle order. Slow, but
+    straightforward. Same args and result as compute_for_radius; timer and columns are ignored.
+    """
+    center_x, center_y, radius, check_dimensions_flag, difference_threshold, _ = args
+
+    def distance(point):
+        return math.sqrt((point[0] - center_x) ** 2 + (point[1] - center_y) ** 2)
+
+    inside_points = [(gx, gy)
+                     for gx in range(math.floor(center_x - radius), math.ceil(center_x + radius) + 1)
+                     for gy in range(math.floor(center_y - radius), math.ceil(center_y + radius) + 1)
+                     if distance((gx, gy)) <= radius]
+    if len(inside_points) < 3:
+        return None
+
+    hull = reference_hull(inside_points)
+    if len(hull) < 3:
+        return None
+
+    simplified = reference_remove_collinear(hull)
+    if len(simplified) < 3:
+        return None
+
+    if check_dimensions_flag:
+        ordered = sorted(simplified, key=lambda p: math.atan2(p[1] - center_y, p[0] - center_x) % (2 * math.pi))
+        if not all(reference_edge_buildable(abs(B[0] - A[0]), abs(B[1] - A[1]))
+                   for A, B in zip(ordered, ordered[1:] + ordered[:1])):
+            return None
+
+    real_radius = max(distance(p) for p in simplified)
+    max_diff = max(abs(distance(p) - real_radius) for p in simplified)
+    if max_diff > difference_threshold:
+        return None
+
+    x_values = [p[0] for p in simplified]
+    diameter = max(x_values) - min(x_values)
+
+    n = len(simplified)
+    edges = [(simplified[i], simplified[(i + 1) % n]) for i in range(n)]
+    area = abs(sum(A[0] * B[1] - B[0] * A[1] for A, B in edges)) / 2.0
+    side_lengths = [math.hypot(B[0] - A[0], B[1] - A[1]) for A, B in edges]
+    perimeter = sum(side_lengths)
+    circularity = (4 * math.pi * area) / (perimeter ** 2) if perimeter > 0 else 0
+
+    widths = []
+    for A, B in edges:
+        delta_x = abs(B[0] - A[0])
+        delta_y = abs(B[1] - A[1])
+        if delta_x == 0 and delta_y == 0:
+            continue
+        common_divisor = gcd(delta_x, delta_y) if delta_x and delta_y else max(delta_x, delta_y)
+        widths.append(min(delta_x // common_divisor, delta_y // common_divisor))
+    max_width = max(widths) if widths else 0
+
+    max_length = max(side_lengths)
+    uniformity = (perimeter / n) / max_length if max_length != 0 else 0
+
+    return (radius, n, real_radius, max_diff, max_width, diameter, circularity, tuple(simplified), uniformity)
+
+def reference_hull(points):
+    points = sorted(points)
+
+    def cross(o, a, b):
+        return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+    def chain(points):
+        chain = []
+        for p in points:
+            while len(chain) >= 2 and cross(chain[-2], chain[-1], p) <= 0:
+                chain.pop()
+            chain.append(p)
+        return chain
+
+    return chain(points)[:-1] + chain(reversed(points))[:-1]
+
+def reference_remove_collinear(points):
+    changed = True
+    while changed and len(points) >= 3:
+        changed = False
+        kept = []
+        n = len(points)
+        for i in range(n):
+            a, b, c = points[(i - 1) % n], points[i], points[(i + 1) % n]
+            collinear = (b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0]) == 0
+            between = min(a[0], c[0]) <= b[0] <= max(a[0], c[0]) and min(a[1], c[1]) <= b[1] <= max(a[1], c[1])
+            if collinear and between:
+                changed = True
+            else:
+                kept.append(b)
+        points = kept
+    return points
+
+def reference_edge_buildable(delta_x, delta_y):
+    if delta_x == 0 or delta_y == 0 or delta_x == delta_y:
+        return True
+    if delta_x <= 8 and delta_y <= 8:
+        return True
+    common_divisor = gcd(delta_x, delta_y)
+    return common_divisor > 1 and delta_x // common_divisor <= 8 and delta_y // common_divisor <= 8
+
+ENGINES = {
+    "reference": reference_engine,
+    "column": compute_for_radius,
+    "symmetric": compute_for_radius_symmetric
+}
+
+def rotate_to_min(polygon):
+    start = polygon.index(min(polygon))
+    return tuple(polygon[start:] + polygon[:start])
+
+def compare_results(expected, actual, tolerance=DEFAULT_TOLERANCE):
+    """
+    Differences between two engine results as (field, expected, actual) tuples, empty when they agree.
+    """
+    if expected is None or actual is None:
+        return [] if expected is actual else [("result", expected is not None and "polygon", actual is not None and "polygon")]
+    differences = []
+    if set(expected[7]) != set(actual[7]):
+        differences.append(("vertices", sorted(set(expected[7]) - set(actual[7])), sorted(set(actual[7]) - set(expected[7]))))
+    elif rotate_to_min(expected[7]) != rotate_to_min(actual[7]):
+        differences.append(("vertex order", expected[7], actual[7]))
+    for index, name in INT_FIELDS:
+        if expected[index] != actual[index]:
+            differences.append((name, expected[index], actual[index]))
+    for index, name in FLOAT_FIELDS:
+        if not math.isclose(expected[index], actual[index], rel_tol=tolerance, abs_tol=tolerance):
+            differences.append((name, expected[index], actual[index]))
+    return differences
+
+def verification_radii(center_x, center_y, initial_radius, max_radius):
+    """
+    Every critical radius in the range and the midpoint after each: the first is where rounding at the circle's
+    edge matters, the second is a radius no grid point is exactly on.
+    """
+    radii = critical_radii(lattice_distances(center_x, center_y, max_radius + 2), initial_radius, max_radius)
+    midpoints = [(a + b) / 2 for a, b in zip(radii, radii[1:])]
+    return sorted(radii + midpoints)
+
+def verify(engine, reference, centers, initial_radius, max_radius, check_dimensions_flag, difference_threshold,
+           tolerance=DEFAULT_TOLERANCE, max_divergences=10):
+    """
+    Runs both engines over verification_radii for every (center_x, center_y). Returns the number of radii checked,
+    the number that diverged and the first max_divergences of them as (center, radius, differences).
+    """
+    checked = 0
+    diverged = 0
+    divergences = []
+    for center_x, center_y in centers:
+        for radius in verification_radii(center_x, center_y, initial_radius, max_radius):
+            args = (center_x, center_y, radius, check_dimensions_flag, difference_threshold, FILTERS)
+            differences = compare_results(reference(args), engine(args), tolerance)
+            checked += 1
+            if differences:
+                diverged += 1
+                if len(divergences) < max_divergences:
+                    divergences.append(((center_x, center_y), radius, differences))
+    return checked, diverged, divergences
+
+def first_appearances(results):
+    """
+    {polygon_key: result} with the result of the smallest radius each polygon appears at.
+    """
+    first = {}
+    for res in sorted(results, key=lambda res: res[0]):
+        first.setdefault(polygon_key(res[7]), res)
+    return first
+
+def verify_sweep(engine, reference, centers, initial_radius, max_radius, check_dimensions_flag, difference_threshold,
+                 tolerance=DEFAULT_TOLERANCE, max_divergences=10, workers=1):
+    """
+    Runs engine over every critical radius of every center in one sweep.run_sweeps call and the reference over the
+    same radii directly, then compares the polygons they found and the result each first appeared with. Returns
+    the number of polygons compared and the rest as verify does; a polygon only one side found has a "result"
+    difference.
+    """
+    plans = []
+    for center_x, center_y in centers:
+        radii = critical_radii(lattice_distances(center_x, center_y, max_radius + 2), initial_radius, max_radius)
+        plans.append(((center_x, center_y, check_dimensions_flag, difference_threshold, FILTERS), radii))
+    swept, _ = run_sweeps(engine, plans, workers)
+
+    checked = 0
+    diverged = 0
+    divergences = []
+    for (settings, radii), transitions in zip(plans, swept):
+        expected = first_appearances(res for res in (reference(settings[:2] + (radius,) + settings[2:]) for radius in radii)
+                                     if res is not None)
+        actual = first_appearances(transitions)
+        for key in sorted(expected.keys() | actual.keys(), key=lambda key: (expected.get(key) or actual.get(key))[0]):
+            checked += 1
+            expected_res, actual_res = expected.get(key), actual.get(key)
+            differences = compare_results(expected_res, actual_res, tolerance)
+            if expected_res is not None and actual_res is not None and expected_res[0] != actual_res[0]:
+                differences.append(("first radius", expected_res[0], actual_res[0]))
+            if differences:
+                diverged += 1
+                if len(divergences) < max_divergences:
+                    divergences.append((settings[:2], (expected_res or actual_res)[0], differences))
+    return checked, diverged, divergences
+
+def results_checksum(database_path, decimals=CHECKSUM_DECIMALS):
+    """
+    SHA-256 of a results table's content: one canonical line per row, with floats rounded to decimals and the
+    vertices decoded, sorted, so the order rows were written in and the file's layout don't matter.
+    """
+    conn = sqlite3.connect(f"file:{database_path}?mode=ro", uri=True)
+    rows = conn.execute("""SELECT odd_center, tested_radius, max_tested_radius, sides, real_radius, max_diff, max_width, diameter, circularity, uniformity, vertices
+                           FROM results""").fetchall()
+    conn.close()
+
+    def value(v):
+        if v is None:
+            return "null"
+        if isinstance(v, float):
+            return f"{v:.{decimals}f}"
+        return str(v)
+
+    lines = sorted(";".join(value(v) for v in row[:-1]) + ";" + ",".join(f"{x} {y}" for x, y in rotate_to_min(decode_vertices(row[-1])))
+                   for row in rows)
+    digest = hashlib.sha256()
+    for line in lines:
+        digest.update(line.encode())
+        digest.update(b"\n")
+    return digest.hexdigest(), len(lines)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Compare two generator engines over a radius range, and checksum results databases.")
+    parser.add_argument("--engine", choices=ENGINES, default="symmetric", help="Engine under test (default: %(default)s)")
+    parser.add_argument("--reference", choices=ENGINES, default="reference", help="Engine it must match (default: %(default)s)")
+    parser.add_argument("--initial-radius", type=float, default=1)
+    parser.add_argument("--max-radius", type=float, default=DEFAULT_CONFIG["MAX_RADIUS"])
+    parser.add_argument("--center", choices=("even", "odd", "both"), default="both")
+    parser.add_argument("--no-check-dimensions", dest="check_dimensions", action="store_false", default=DEFAULT_CONFIG["CHECK_DIMENSIONS"])
+    parser.add_argument("--difference-threshold", type=float, default=DEFAULT_CONFIG["DIFFERENCE_THRESHOLD"])
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Relative and absolute tolerance for float metrics")
+    parser.add_argument("--max-divergences", type=int, default=10, help="How many divergent radii to list")
+    parser.add_argument("--sweep", action="store_true", help="Run the engine through a sweep (lattice tables, batches, workers) and compare the polygons it finds")
+    parser.add_argument("--workers", type=int, default=DEFAULT_CONFIG["WORKERS"], help="Worker processes for --sweep (default: %(default)s)")
+    parser.add_argument("--checksum", metavar="DB", nargs="+", default=[], help="Results databases to checksum instead of comparing engines")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.checksum:
+        checksums = set()
+        for path in args.checksum:
+            checksum, rows = results_checksum(path)
+            checksums.add(checksum)
+            print(f"{checksum}  {rows} rows  {path}")
+        if len(args.checksum) > 1:
+            print("Same content" if len(checksums) == 1 else "Content differs")
+        sys.exit(0 if len(checksums) == 1 else 1)
+
+    centers = {"even": [(0.0, 0.0)], "odd": [(0.5, 0.5)], "both": [(0.0, 0.0), (0.5, 0.5)]}[args.center]
+    if args.sweep:
+        checked, diverged, divergences = verify_sweep(ENGINES[args.engine], ENGINES[args.reference], centers,
+                                                      args.initial_radius, args.max_radius, args.check_dimensions,
+                                                      args.difference_threshold, args.tolerance, args.max_divergences,
+                                                      args.workers)
+        print(f"{args.engine} sweep on {args.workers} workers vs {args.reference}: {checked} polygons checked, {diverged} diverged")
+    else:
+        checked, diverged, divergences = verify(ENGINES[args.engine], ENGINES[args.reference], centers,
+                                                args.initial_radius, args.max_radius, args.check_dimensions,
+                                                args.difference_threshold, args.tolerance, args.max_divergences)
+        print(f"{args.engine} vs {args.reference}: {checked} radii checked, {diverged} diverged")
+    for center, radius, differences in divergences:
+        print(f"  center {center}, radius {radius!r}:")
+        for field, expected, actual in differences:
+            print(f"    {field}: {args.reference} {expected!r}, {args.engine} {actual!r}")
+    sys.exit(1 if diverged else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+import math
+
+# Kept identical in poly-circle-to-db/ and poly-circle-from-db/; decodeVertices in index.html reads the same format.
+#
+# Binary polygon vertices, version 1:
+#   byte 0   format version
+#   byte 1   flags: ODD_CENTER_FLAG, FULL_LIST_FLAG
+#   then unsigned LEB128 varints, starting with the vertex count.
+# Polygons centered on the grid have 8-fold symmetry, so normally only the vertices in the octant 0 <= X <= Y are
+# stored, in doubled coordinates relative to the center (X = 2x - 1 around an odd center, X = 2x around an even one).
+# They go from the diagonal to the Y axis, where X only decreases and Y never does: the first as X, Y, then each as
+# the decrease in X and the increase in Y. The rest of the polygon is rebuilt by mirroring, in counter-clockwise
+# order starting at the smallest vertex. A polygon that doesn't round-trip that way is stored with FULL_LIST_FLAG
+# instead: every vertex in order, as zigzag-encoded steps from the previous one (the first from (0, 0)).
+
+VERTICES_VERSION = 1
+ODD_CENTER_FLAG = 1
+FULL_LIST_FLAG = 2
+
+def write_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def read_varint(data, index):
+    value = 0
+    shift = 0
+    while True:
+        byte = data[index]
+        index += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, index
+        shift += 7
+
+def zigzag(value):
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+def unzigzag(value):
+    return value // 2 if value % 2 == 0 else -(value + 1) // 2
+
+def mirror_vertices(octant, odd_center):
+    """
+    Full polygon from its octant vertices (doubled coordinates), counter-clockwise from the smallest vertex.
+    """
+    offset = 1 if odd_center else 0
+    images = set()
+    for x, y in octant:
+        for a, b in ((x, y), (y, x)):
+            images.update(((a, b), (-a, b), (a, -b), (-a, -b)))
+    points = sorted(images, key=lambda p: math.atan2(p[1], p[0]))
+    polygon = [((x + offset) // 2, (y + offset) // 2) for x, y in points]
+    if not polygon:
+        return ()
+    start = polygon.index(min(polygon))
+    return tuple(polygon[start:] + polygon[:start])
+
+def is_canonical(polygon, doubled):
+    """
+    Whether mirror_vertices rebuilds exactly this polygon from its octant: strictly convex, counter-clockwise, starting
+    at its smallest vertex and unchanged by the polygon's 8 symmetries. Cheaper than rebuilding it and comparing.
+    """
+    if len(polygon) < 3 or polygon[0] != min(polygon):
+        return False
+    previous = doubled[-1:] + doubled[:-1]
+    following = doubled[1:] + doubled[:1]
+    for (ax, ay), (bx, by), (cx, cy) in zip(previous, doubled, following):
+        if (bx - ax) * (cy - ay) - (by - ay) * (cx - ax) <= 0:
+            return False
+    points = set(doubled)
+    return all((y, x) in points and (-x, y) in points for x, y in points)
+
+def encode_vertices(polygon, odd_center):
+    polygon = tuple(tuple(point) for point in polygon)
+    offset = 1 if odd_center else 0
+    doubled = [(2 * x - offset, 2 * y - offset) for x, y in polygon]
+    flags = ODD_CENTER_FLAG if odd_center else 0
+
+    out = bytearray()
+    if is_canonical(polygon, doubled):
+        octant = sorted((p for p in doubled if 0 <= p[0] <= p[1]), key=lambda p: -p[0])
+        out += bytes((VERTICES_VERSION, flags))
+        write_varint(out, len(octant))
+        previous_x, previous_y = 0, 0
+        for i, (x, y) in enumerate(octant):
+            if i == 0:
+                write_varint(out, x)
+                write_varint(out, y)
+            else:
+                write_varint(out, previous_x - x)
+                write_varint(out, y - previous_y)
+            previous_x, previous_y = x, y
+    else:
+        out += bytes((VERTICES_VERSION, flags | FULL_LIST_FLAG))
+        write_varint(out, len(polygon))
+        previous_x, previous_y = 0, 0
+        for x, y in polygon:
+            write_varint(out, zigzag(x - previous_x))
+            write_varint(out, zigzag(y - previous_y))
+            previous_x, previous_y = x, y
+    return bytes(out)
+
+def decode_vertices(data):
+    """
+    Polygon tuple from encode_vertices' bytes. Raises ValueError for an unknown format version.
+    """
+    if data[0] != VERTICES_VERSION:
+        raise ValueError(f"Unsupported vertices format version {data[0]}")
+    flags = data[1]
+    count, index = read_varint(data, 2)
+
+    points = []
+    x, y = 0, 0
+    for i in range(count):
+        step_x, index = read_varint(data, index)
+        step_y, index = read_varint(data, index)
+        if flags & FULL_LIST_FLAG:
+            x += unzigzag(step_x)
+            y += unzigzag(step_y)
+        elif i == 0:
+            x, y = step_x, step_y
+        else:
+            x -= step_x
+            y += step_y
+        points.append((x, y))
+
+    if flags & FULL_LIST_FLAG:
+        return tuple(points)
+    return mirror_vertices(points, flags & ODD_CENTER_FLAG)